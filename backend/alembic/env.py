@@ -0,0 +1,55 @@
+from logging.config import fileConfig
+from alembic import context
+from app import models
+from app.database import engine
+from app.services.search_service import SQLITE_SEARCH_TABLES
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = models.Base.metadata
+
+def include_name(name, type_, parent_names):
+    """SQLite 全文索引表及其影子表由迁移直接创建，不与模型比较"""
+    if type_ == "table":
+        return not name.startswith(SQLITE_SEARCH_TABLES)
+    return True
+
+def include_object_for(dialect_name: str):
+    """info 标记为 postgresql_only 的索引（如 pg_trgm 索引）只在 PostgreSQL 上存在"""
+    def include_object(object, name, type_, reflected, compare_to):
+        if type_ == "index" and object.info.get("postgresql_only"):
+            return dialect_name == "postgresql"
+        return True
+    return include_object
+
+def run_migrations_offline():
+    """生成 SQL 脚本而不连接数据库"""
+    context.configure(
+        url=engine.url.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    """使用应用的 engine 执行迁移"""
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=connection.dialect.name == "sqlite",
+            include_name=include_name,
+            include_object=include_object_for(connection.dialect.name),
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
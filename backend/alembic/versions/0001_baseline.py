@@ -0,0 +1,87 @@
+"""baseline schema
+
+之前由 create_all 创建的表结构。已有数据库执行 `alembic stamp 0001_baseline` 后再升级。
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "buildings",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String()),
+        sa.Column("address", sa.String()),
+    )
+    op.create_index("ix_buildings_id", "buildings", ["id"])
+    op.create_index("ix_buildings_name", "buildings", ["name"])
+
+    op.create_table(
+        "tenants",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String()),
+        sa.Column("phone", sa.String()),
+    )
+    op.create_index("ix_tenants_id", "tenants", ["id"])
+    op.create_index("ix_tenants_name", "tenants", ["name"])
+
+    op.create_table(
+        "rooms",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("building_id", sa.Integer(), sa.ForeignKey("buildings.id")),
+        sa.Column("room_number", sa.String()),
+        sa.Column("area", sa.Float()),
+        sa.Column("status", sa.String()),
+        sa.Column("last_water_reading", sa.Float()),
+        sa.Column("last_elec_reading", sa.Float()),
+    )
+    op.create_index("ix_rooms_id", "rooms", ["id"])
+    op.create_index("ix_rooms_room_number", "rooms", ["room_number"])
+    op.create_index("ix_rooms_status", "rooms", ["status"])
+
+    op.create_table(
+        "leases",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("room_id", sa.Integer(), sa.ForeignKey("rooms.id")),
+        sa.Column("tenant_id", sa.Integer(), sa.ForeignKey("tenants.id")),
+        sa.Column("start_date", sa.Date()),
+        sa.Column("end_date", sa.Date()),
+        sa.Column("rent_amount", sa.Float()),
+        sa.Column("deposit", sa.Float()),
+        sa.Column("status", sa.String()),
+    )
+    op.create_index("ix_leases_id", "leases", ["id"])
+    op.create_index("ix_leases_status", "leases", ["status"])
+
+    op.create_table(
+        "bills",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("lease_id", sa.Integer(), sa.ForeignKey("leases.id")),
+        sa.Column("period", sa.String()),
+        sa.Column("rent_fee", sa.Float()),
+        sa.Column("water_fee", sa.Float()),
+        sa.Column("elec_fee", sa.Float()),
+        sa.Column("total_amount", sa.Float()),
+        sa.Column("status", sa.String()),
+        sa.Column("due_date", sa.Date()),
+    )
+    op.create_index("ix_bills_id", "bills", ["id"])
+    op.create_index("ix_bills_period", "bills", ["period"])
+    op.create_index("ix_bills_status", "bills", ["status"])
+
+
+def downgrade():
+    op.drop_table("bills")
+    op.drop_table("leases")
+    op.drop_table("rooms")
+    op.drop_table("tenants")
+    op.drop_table("buildings")
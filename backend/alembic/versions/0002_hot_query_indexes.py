@@ -0,0 +1,51 @@
+"""hot query indexes, unique (lease_id, period), billing summary
+
+Revision ID: 0002_hot_query_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002_hot_query_indexes"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # bills：游标分页、状态（含逾期）过滤、按合同查询且每期唯一
+    op.create_index("ix_bills_due_date_id", "bills", ["due_date", "id"])
+    op.create_index("ix_bills_status_due_date", "bills", ["status", "due_date"])
+    op.drop_index("ix_bills_status", table_name="bills")
+    # 已存在重复的 (lease_id, period) 账单时此步会失败，需先人工清理
+    op.create_index("uq_bills_lease_id_period", "bills", ["lease_id", "period"], unique=True)
+
+    # leases：租客查询有效合同、按房间关联
+    op.create_index("ix_leases_tenant_id_status", "leases", ["tenant_id", "status"])
+    op.create_index("ix_leases_room_id", "leases", ["room_id"])
+
+    # rooms：按楼宇统计/筛选状态
+    op.create_index("ix_rooms_building_id_status", "rooms", ["building_id", "status"])
+
+    op.create_table(
+        "billing_summary",
+        sa.Column("building_id", sa.Integer(), sa.ForeignKey("buildings.id"), primary_key=True),
+        sa.Column("period", sa.String(), primary_key=True),
+        sa.Column("due_date", sa.Date(), primary_key=True),
+        sa.Column("bill_count", sa.Integer()),
+        sa.Column("billed_amount", sa.Float()),
+        sa.Column("collected_amount", sa.Float()),
+        sa.Column("outstanding_amount", sa.Float()),
+    )
+
+
+def downgrade():
+    op.drop_table("billing_summary")
+    op.drop_index("ix_rooms_building_id_status", table_name="rooms")
+    op.drop_index("ix_leases_room_id", table_name="leases")
+    op.drop_index("ix_leases_tenant_id_status", table_name="leases")
+    op.drop_index("uq_bills_lease_id_period", table_name="bills")
+    op.create_index("ix_bills_status", "bills", ["status"])
+    op.drop_index("ix_bills_status_due_date", table_name="bills")
+    op.drop_index("ix_bills_due_date_id", table_name="bills")
@@ -0,0 +1,29 @@
+"""idempotency keys for bill payment
+
+Revision ID: 0003_idempotency_keys
+Revises: 0002_hot_query_indexes
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003_idempotency_keys"
+down_revision = "0002_hot_query_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "idempotency_keys",
+        sa.Column("tenant_id", sa.Integer(), primary_key=True),
+        sa.Column("key", sa.String(), primary_key=True),
+        sa.Column("request", sa.String()),
+        sa.Column("status_code", sa.Integer()),
+        sa.Column("response_body", sa.Text()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+
+
+def downgrade():
+    op.drop_table("idempotency_keys")
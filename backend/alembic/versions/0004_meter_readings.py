@@ -0,0 +1,36 @@
+"""meter reading history
+
+Revision ID: 0004_meter_readings
+Revises: 0003_idempotency_keys
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004_meter_readings"
+down_revision = "0003_idempotency_keys"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "meter_readings",
+        sa.Column("room_id", sa.Integer(), sa.ForeignKey("rooms.id"), primary_key=True),
+        sa.Column("read_at", sa.DateTime(), primary_key=True),
+        sa.Column("building_id", sa.Integer(), sa.ForeignKey("buildings.id")),
+        sa.Column("bill_id", sa.Integer()),
+        sa.Column("period", sa.String()),
+        sa.Column("water_reading", sa.Float()),
+        sa.Column("elec_reading", sa.Float()),
+        sa.Column("water_usage", sa.Float()),
+        sa.Column("elec_usage", sa.Float()),
+    )
+    op.create_index("ix_meter_readings_building_id_read_at", "meter_readings", ["building_id", "read_at"])
+    op.create_index("ix_meter_readings_read_at", "meter_readings", ["read_at"], postgresql_using="brin")
+
+
+def downgrade():
+    op.drop_index("ix_meter_readings_read_at", table_name="meter_readings")
+    op.drop_index("ix_meter_readings_building_id_read_at", table_name="meter_readings")
+    op.drop_table("meter_readings")
@@ -0,0 +1,49 @@
+"""tariffs and bill usage columns
+
+Revision ID: 0005_tariffs
+Revises: 0004_meter_readings
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005_tariffs"
+down_revision = "0004_meter_readings"
+branch_labels = None
+depends_on = None
+
+# 引入价格表之前的固定单价，用于由已有费用回填用量
+LEGACY_WATER_UNIT_PRICE = 5.0
+LEGACY_ELEC_UNIT_PRICE = 1.0
+
+
+def upgrade():
+    op.create_table(
+        "tariffs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("building_id", sa.Integer(), sa.ForeignKey("buildings.id"), nullable=True),
+        sa.Column("utility", sa.String()),
+        sa.Column("effective_from", sa.Date()),
+        sa.Column("tiers", sa.JSON()),
+    )
+    op.create_index("ix_tariffs_id", "tariffs", ["id"])
+    op.create_index(
+        "ix_tariffs_building_id_utility_effective_from", "tariffs", ["building_id", "utility", "effective_from"]
+    )
+
+    with op.batch_alter_table("bills") as batch_op:
+        batch_op.add_column(sa.Column("water_usage", sa.Float()))
+        batch_op.add_column(sa.Column("elec_usage", sa.Float()))
+    op.execute(
+        f"UPDATE bills SET water_usage = COALESCE(water_fee, 0) / {LEGACY_WATER_UNIT_PRICE}, "
+        f"elec_usage = COALESCE(elec_fee, 0) / {LEGACY_ELEC_UNIT_PRICE}"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table("bills") as batch_op:
+        batch_op.drop_column("elec_usage")
+        batch_op.drop_column("water_usage")
+    op.drop_index("ix_tariffs_building_id_utility_effective_from", table_name="tariffs")
+    op.drop_index("ix_tariffs_id", table_name="tariffs")
+    op.drop_table("tariffs")
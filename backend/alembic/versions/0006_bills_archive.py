@@ -0,0 +1,40 @@
+"""archive table for settled bills
+
+Revision ID: 0006_bills_archive
+Revises: 0005_tariffs
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006_bills_archive"
+down_revision = "0005_tariffs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "bills_archive",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("lease_id", sa.Integer(), sa.ForeignKey("leases.id")),
+        sa.Column("period", sa.String()),
+        sa.Column("rent_fee", sa.Float()),
+        sa.Column("water_fee", sa.Float()),
+        sa.Column("elec_fee", sa.Float()),
+        sa.Column("water_usage", sa.Float()),
+        sa.Column("elec_usage", sa.Float()),
+        sa.Column("total_amount", sa.Float()),
+        sa.Column("status", sa.String()),
+        sa.Column("due_date", sa.Date()),
+    )
+    op.create_index("ix_bills_archive_lease_id_period", "bills_archive", ["lease_id", "period"])
+    op.create_index("ix_bills_archive_period", "bills_archive", ["period"])
+    op.create_index("ix_bills_archive_due_date_id", "bills_archive", ["due_date", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_bills_archive_due_date_id", table_name="bills_archive")
+    op.drop_index("ix_bills_archive_period", table_name="bills_archive")
+    op.drop_index("ix_bills_archive_lease_id_period", table_name="bills_archive")
+    op.drop_table("bills_archive")
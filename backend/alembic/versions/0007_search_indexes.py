@@ -0,0 +1,69 @@
+"""search indexes for tenants and rooms
+
+Revision ID: 0007_search_indexes
+Revises: 0006_bills_archive
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0007_search_indexes"
+down_revision = "0006_bills_archive"
+branch_labels = None
+depends_on = None
+
+TRIGRAM_INDEXES = (
+    ("ix_tenants_name_trgm", "tenants", "name"),
+    ("ix_tenants_phone_trgm", "tenants", "phone"),
+    ("ix_rooms_room_number_trgm", "rooms", "room_number"),
+    ("ix_buildings_name_trgm", "buildings", "name"),
+)
+
+# SQLite：外部内容 FTS5 表，触发器只在被索引的列变化时同步
+# 注意：batch_alter_table 会重建源表并丢失这些触发器，修改 tenants/rooms 的迁移需重新创建
+SQLITE_SEARCH = {
+    "tenants_search": ("tenants", ("name", "phone")),
+    "rooms_search": ("rooms", ("room_number",)),
+}
+
+
+def upgrade():
+    if op.get_context().dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for name, table, column in TRIGRAM_INDEXES:
+            op.create_index(name, table, [column], postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"})
+    elif op.get_context().dialect.name == "sqlite":
+        for search_table, (table, columns) in SQLITE_SEARCH.items():
+            column_list = ", ".join(columns)
+            new_values = ", ".join(f"new.{c}" for c in columns)
+            old_values = ", ".join(f"old.{c}" for c in columns)
+            op.execute(
+                f"CREATE VIRTUAL TABLE {search_table} USING fts5({column_list}, "
+                f"content='{table}', content_rowid='id', tokenize='trigram')"
+            )
+            op.execute(
+                f"CREATE TRIGGER {search_table}_ai AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {search_table}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER {search_table}_ad AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {search_table}({search_table}, rowid, {column_list}) "
+                f"VALUES ('delete', old.id, {old_values}); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER {search_table}_au AFTER UPDATE OF {column_list} ON {table} BEGIN "
+                f"INSERT INTO {search_table}({search_table}, rowid, {column_list}) "
+                f"VALUES ('delete', old.id, {old_values}); "
+                f"INSERT INTO {search_table}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+            )
+            op.execute(f"INSERT INTO {search_table}({search_table}) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_context().dialect.name == "postgresql":
+        for name, table, _ in TRIGRAM_INDEXES:
+            op.drop_index(name, table_name=table)
+    elif op.get_context().dialect.name == "sqlite":
+        for search_table in SQLITE_SEARCH:
+            for suffix in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {search_table}_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {search_table}")
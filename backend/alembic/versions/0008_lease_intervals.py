@@ -0,0 +1,30 @@
+"""lease interval index and overlap constraint
+
+Revision ID: 0008_lease_intervals
+Revises: 0007_search_indexes
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0008_lease_intervals"
+down_revision = "0007_search_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_leases_room_id_end_date", "leases", ["room_id", "end_date"])
+    if op.get_context().dialect.name == "postgresql":
+        # 同一房间的有效合同 [start_date, end_date) 不能重叠；已存在重叠的有效合同时迁移会失败，需先清理数据
+        op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        op.execute(
+            "ALTER TABLE leases ADD CONSTRAINT ex_leases_room_id_period "
+            "EXCLUDE USING gist (room_id WITH =, daterange(start_date, end_date) WITH &&) "
+            "WHERE (status = 'Active')"
+        )
+
+
+def downgrade():
+    if op.get_context().dialect.name == "postgresql":
+        op.execute("ALTER TABLE leases DROP CONSTRAINT ex_leases_room_id_period")
+    op.drop_index("ix_leases_room_id_end_date", table_name="leases")
@@ -0,0 +1,37 @@
+"""never reuse bill ids on SQLite
+
+Revision ID: 0009_bills_autoincrement
+Revises: 0008_lease_intervals
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0009_bills_autoincrement"
+down_revision = "0008_lease_intervals"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 归档账单保留原 id 并从 bills 删除；SQLite 的普通整数主键会复用已删除的最大 id，
+    # 改为 AUTOINCREMENT 并把序列推进到在线和归档账单的最大 id。PostgreSQL 的序列不会回退，无需处理
+    if op.get_context().dialect.name != "sqlite":
+        return
+    with op.batch_alter_table("bills", recreate="always", table_kwargs={"sqlite_autoincrement": True}):
+        pass
+    op.execute(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'bills', 0 "
+        "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'bills')"
+    )
+    op.execute(
+        "UPDATE sqlite_sequence SET seq = MAX(seq, "
+        "COALESCE((SELECT MAX(id) FROM bills), 0), COALESCE((SELECT MAX(id) FROM bills_archive), 0)) "
+        "WHERE name = 'bills'"
+    )
+
+
+def downgrade():
+    if op.get_context().dialect.name != "sqlite":
+        return
+    with op.batch_alter_table("bills", recreate="always", table_kwargs={"sqlite_autoincrement": False}):
+        pass
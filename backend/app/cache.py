@@ -0,0 +1,172 @@
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+# 缓存后端：memory（进程内）或 sqlite（同一台机器上多个 worker 共享）
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+CACHE_TTL = float(os.getenv("CACHE_TTL", 60))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 1024))
+CACHE_PATH = os.getenv("CACHE_PATH", os.path.join(tempfile.gettempdir(), "propmanage_cache.sqlite3"))
+
+class MemoryCacheBackend:
+    """进程内缓存，按 LRU 和 TTL 淘汰"""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._versions = {}
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: tuple):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_version(self, resource: str) -> int:
+        with self._lock:
+            return self._versions.get(resource, 0)
+
+    def bump_version(self, resource: str):
+        with self._lock:
+            self._versions[resource] = self._versions.get(resource, 0) + 1
+
+class SQLiteCacheBackend:
+    """基于本地 SQLite 文件的共享缓存，供同一台机器上的多个 worker 共用版本号和缓存内容"""
+
+    def __init__(self, path: str = CACHE_PATH, max_entries: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, etag TEXT, body BLOB, expires_at REAL, accessed_at REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_entries_accessed_at ON entries (accessed_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS versions (resource TEXT PRIMARY KEY, version INTEGER)")
+
+    def _connect(self):
+        # 每个线程使用独立连接
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str):
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute("SELECT etag, body, expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if row[2] < now:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            return None
+        conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return row[0], row[1]
+
+    def set(self, key: str, value: tuple):
+        conn = self._connect()
+        now = time.time()
+        etag, body = value
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (key, etag, body, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+            (key, etag, body, now + self.ttl, now)
+        )
+        conn.execute("DELETE FROM entries WHERE expires_at < ?", (now,))
+        conn.execute(
+            "DELETE FROM entries WHERE key IN ("
+            "SELECT key FROM entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def get_version(self, resource: str) -> int:
+        row = self._connect().execute("SELECT version FROM versions WHERE resource = ?", (resource,)).fetchone()
+        return row[0] if row else 0
+
+    def bump_version(self, resource: str):
+        self._connect().execute(
+            "INSERT INTO versions (resource, version) VALUES (?, 1) "
+            "ON CONFLICT (resource) DO UPDATE SET version = version + 1",
+            (resource,)
+        )
+
+CACHE_BACKENDS = {
+    "memory": MemoryCacheBackend,
+    "sqlite": SQLiteCacheBackend,
+}
+
+class ResponseCache:
+    """读多写少接口的响应缓存
+
+    缓存键包含相关资源的版本号，写操作调用 invalidate 递增版本号后旧缓存自然失效。
+    缓存的是序列化后的 JSON，命中时既不访问数据库也不经过 Pydantic，
+    并按 ETag / If-None-Match 返回 304。
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._adapters = {}
+
+    def key_for(self, request: Request, resources: list) -> str:
+        """根据请求路径、查询参数和资源版本生成缓存键（应在查询数据库之前调用）"""
+        versions = ",".join(f"{resource}:{self.backend.get_version(resource)}" for resource in resources)
+        return f"{request.url.path}?{request.url.query}|{versions}"
+
+    def lookup(self, request: Request, key: str):
+        """命中缓存时返回响应（200 或 304），否则返回 None"""
+        entry = self.backend.get(key)
+        if entry is None:
+            return None
+        etag, body = entry
+        return self._respond(request, etag, body)
+
+    def store(self, request: Request, key: str, schema, data) -> Response:
+        """按 schema 序列化数据并写入缓存，返回响应"""
+        adapter = self._adapters.get(schema)
+        if adapter is None:
+            adapter = self._adapters[schema] = TypeAdapter(schema)
+        body = adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+        return self.store_body(request, key, body)
+
+    def store_body(self, request: Request, key: str, body: bytes) -> Response:
+        """写入已序列化的 JSON 并返回响应"""
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        self.backend.set(key, (etag, body))
+        return self._respond(request, etag, body)
+
+    def invalidate(self, *resources: str):
+        for resource in resources:
+            self.backend.bump_version(resource)
+
+    def _respond(self, request: Request, etag: str, body: bytes) -> Response:
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+response_cache = ResponseCache(CACHE_BACKENDS[CACHE_BACKEND]())
@@ -0,0 +1,213 @@
+import asyncio
+import itertools
+import logging
+import os
+import orjson
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from app.database import async_engine
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL 上跨 worker 传递事件的 NOTIFY 通道
+EVENT_CHANNEL = "propmanage_events"
+# 空闲连接的心跳间隔（秒），避免代理因超时断开
+SSE_HEARTBEAT = float(os.getenv("SSE_HEARTBEAT", 15))
+# 每个订阅者最多积压的事件数，超出时断开并通知客户端重新加载
+SSE_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", 100))
+# LISTEN 连接断开后的重连间隔（秒）
+LISTEN_RETRY_SECONDS = float(os.getenv("EVENTS_LISTEN_RETRY", 5))
+
+# 会话提交后才投递的事件（非 PostgreSQL）
+PENDING_KEY = "pending_events"
+# 事件可能丢失时发送给客户端，客户端应重新加载列表
+RESYNC = b"event: resync\ndata: {}\n\n"
+PING = b": ping\n\n"
+
+def sse_message(data: dict) -> bytes:
+    return b"event: " + data["type"].encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+class Subscription:
+    """一个 SSE 连接：租客订阅者按 tenant_id 过滤，房东订阅者按 building_id 过滤（为空时接收全部）"""
+
+    __slots__ = ("tenant_id", "building_id", "queue")
+
+    def __init__(self, tenant_id: int = None, building_id: int = None):
+        self.tenant_id = tenant_id
+        self.building_id = building_id
+        self.queue = asyncio.Queue(SSE_QUEUE_SIZE)
+
+class ChangeFeed:
+    """账单和合同变更的进程内发布/订阅
+
+    写操作在提交前调用 publish：PostgreSQL 上在同一事务内执行 pg_notify，提交后才会送达，
+    各 worker 通过一个 LISTEN 连接接收后分发给本进程的订阅者；其他数据库在会话提交后直接分发给
+    本进程的订阅者（多 worker 时只能收到同一 worker 内的写入）。
+    订阅者按租客、楼宇建立索引，发布时只访问匹配的订阅者；空闲订阅者只占用一个队列，
+    不占用数据库连接，心跳由一个共享的定时任务统一写入各队列。
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._listener = None
+        self._heartbeat = None
+        self._everything = set()
+        self._by_tenant = {}
+        self._by_building = {}
+
+    def publish(self, db: Session, events: list):
+        """在 db 的当前事务中发布事件，事务提交后送达；每个事件需包含 type、tenant_id 和 building_id"""
+        if not events:
+            return
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                [{"channel": EVENT_CHANNEL, "payload": orjson.dumps(e).decode()} for e in events]
+            )
+        else:
+            db.info.setdefault(PENDING_KEY, []).extend(events)
+
+    def dispatch_threadsafe(self, events: list):
+        """从任意线程把事件交给事件循环分发；还没有订阅者时直接丢弃"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        for data in events:
+            loop.call_soon_threadsafe(self._dispatch, data)
+
+    def _subscriptions(self):
+        return itertools.chain(self._everything, *self._by_tenant.values(), *self._by_building.values())
+
+    def _dispatch(self, data: dict):
+        # 每个订阅者只在一个索引中，三部分不会重复
+        targets = list(itertools.chain(
+            self._everything,
+            self._by_tenant.get(data.get("tenant_id"), ()),
+            self._by_building.get(data.get("building_id"), ()),
+        ))
+        if not targets:
+            return
+        message = sse_message(data)
+        for subscription in targets:
+            try:
+                subscription.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self._overflow(subscription)
+
+    def _overflow(self, subscription: Subscription):
+        """客户端消费过慢：丢弃积压的事件，通知其重新加载后结束连接"""
+        self.unsubscribe(subscription)
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(RESYNC)
+        subscription.queue.put_nowait(None)
+
+    def subscribe(self, tenant_id: int = None, building_id: int = None) -> Subscription:
+        """在事件循环中调用；首次订阅时启动心跳任务，PostgreSQL 上同时启动 LISTEN"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # 应用在新的事件循环中启动（如测试中多次启动），后台任务需重新创建
+            self._loop, self._heartbeat, self._listener = loop, None, None
+        if self._heartbeat is None:
+            self._heartbeat = self._loop.create_task(self._send_heartbeats())
+        if async_engine.dialect.name == "postgresql" and self._listener is None:
+            self._listener = self._loop.create_task(self._listen())
+        subscription = Subscription(tenant_id, building_id)
+        if tenant_id is not None:
+            self._by_tenant.setdefault(tenant_id, set()).add(subscription)
+        elif building_id is not None:
+            self._by_building.setdefault(building_id, set()).add(subscription)
+        else:
+            self._everything.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._everything.discard(subscription)
+        for index, key in ((self._by_tenant, subscription.tenant_id), (self._by_building, subscription.building_id)):
+            subscribers = index.get(key)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del index[key]
+
+    def subscriber_count(self) -> int:
+        return len(self._everything) \
+            + sum(len(s) for s in self._by_tenant.values()) \
+            + sum(len(s) for s in self._by_building.values())
+
+    async def stream(self, subscription: Subscription):
+        """生成 SSE 消息，连接断开时取消订阅"""
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                message = await subscription.queue.get()
+                if message is None:
+                    return
+                yield message
+        finally:
+            self.unsubscribe(subscription)
+
+    def _on_notify(self, connection, pid, channel, payload):
+        self._dispatch(orjson.loads(payload))
+
+    async def _send_heartbeats(self):
+        """定期向所有订阅者写入心跳注释，避免代理因空闲超时断开；积压未读的订阅者跳过"""
+        while True:
+            await asyncio.sleep(SSE_HEARTBEAT)
+            for subscription in self._subscriptions():
+                if subscription.queue.empty():
+                    subscription.queue.put_nowait(PING)
+
+    def _resync_all(self):
+        for subscription in list(self._subscriptions()):
+            self._overflow(subscription)
+
+    async def _listen(self):
+        """保持一个 LISTEN 连接，断开后重连；重连期间可能丢失事件，因此让现有订阅者重新加载"""
+        connected_before = False
+        while True:
+            try:
+                async with async_engine.connect() as conn:
+                    raw = await conn.get_raw_connection()
+                    driver = raw.driver_connection
+                    closed = asyncio.Event()
+                    driver.add_termination_listener(lambda _: closed.set())
+                    await driver.add_listener(EVENT_CHANNEL, self._on_notify)
+                    if connected_before:
+                        self._resync_all()
+                    connected_before = True
+                    try:
+                        await closed.wait()
+                    finally:
+                        if not driver.is_closed():
+                            await driver.remove_listener(EVENT_CHANNEL, self._on_notify)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Event listener connection failed, retrying in %.0fs", LISTEN_RETRY_SECONDS, exc_info=True)
+            await asyncio.sleep(LISTEN_RETRY_SECONDS)
+
+    async def stop(self):
+        """停止心跳和 LISTEN 连接，并结束所有订阅"""
+        for task in (self._heartbeat, self._listener):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._heartbeat = self._listener = None
+        self._resync_all()
+
+change_feed = ChangeFeed()
+
+@event.listens_for(Session, "after_commit")
+def _deliver_pending_events(session):
+    events = session.info.pop(PENDING_KEY, None)
+    if events:
+        change_feed.dispatch_threadsafe(events)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_events(session, previous_transaction):
+    if previous_transaction.parent is None:
+        session.info.pop(PENDING_KEY, None)
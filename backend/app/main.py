@@ -1,14 +1,62 @@
+import time
+# 记录应用模块的导入耗时（含路由、模型等依赖）
+IMPORT_STARTED = time.perf_counter()
+
+import logging
+import os
+from contextlib import AsyncExitStack, ExitStack, asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException, Header
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 from fastapi.middleware.cors import CORSMiddleware
 from app import models, schemas
-from app.database import engine, get_db
-from app.routers import buildings, tenants, leases, bills, my
+from app.database import engine, async_engine, get_db
+from app.events import change_feed
+from app.metrics import SQLMetricsMiddleware, registry
+from app.routers import buildings, rooms, tenants, leases, bills, my, analytics, tariffs, exports, events
+
+IMPORT_SECONDS = time.perf_counter() - IMPORT_STARTED
+
+logger = logging.getLogger(__name__)
+
+# 导入与启动总耗时的预算（毫秒），超出时记录警告；导入 FastAPI/SQLAlchemy 本身约占 1.5 秒
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", 3000))
+# 启动时预先建立的连接数（同步、异步连接池各自建立），默认 0 即首次请求时才连接
+DB_POOL_WARMUP = int(os.getenv("DB_POOL_WARMUP", 0))
+
+def warm_sync_pool(size: int):
+    with ExitStack() as stack:
+        for _ in range(size):
+            stack.enter_context(engine.connect())
 
-# 创建数据库表
-models.Base.metadata.create_all(bind=engine)
+async def warm_async_pool(size: int):
+    async with AsyncExitStack() as stack:
+        for _ in range(size):
+            await stack.enter_async_context(async_engine.connect())
 
-app = FastAPI(title="PropManage Lite API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """启动时不做任何表结构操作（表结构由 Alembic 迁移管理：alembic upgrade head）
+
+    默认也不连接数据库；设置 DB_POOL_WARMUP 时预先建立连接。关闭时结束事件订阅并释放连接池。
+    """
+    started = time.perf_counter()
+    if DB_POOL_WARMUP:
+        await run_in_threadpool(warm_sync_pool, DB_POOL_WARMUP)
+        await warm_async_pool(DB_POOL_WARMUP)
+    startup_seconds = time.perf_counter() - started
+    registry.record_startup(IMPORT_SECONDS, startup_seconds)
+    total_ms = (IMPORT_SECONDS + startup_seconds) * 1000
+    logger.info("Worker %d ready: import %.0f ms, startup %.0f ms", os.getpid(), IMPORT_SECONDS * 1000, startup_seconds * 1000)
+    if total_ms > STARTUP_BUDGET_MS:
+        logger.warning("Boot took %.0f ms, over the %.0f ms budget", total_ms, STARTUP_BUDGET_MS)
+    yield
+    await change_feed.stop()
+    engine.dispose()
+    await async_engine.dispose()
+
+app = FastAPI(title="PropManage Lite API", version="1.0.0", lifespan=lifespan)
 
 # 配置CORS
 origins = [
@@ -24,12 +72,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# SQL 统计（每个请求的查询次数、数据库耗时、N+1 检测）
+app.add_middleware(SQLMetricsMiddleware)
+
 # 包含路由
 app.include_router(buildings.router, prefix="/api", tags=["buildings"])
+app.include_router(rooms.router, prefix="/api", tags=["rooms"])
 app.include_router(tenants.router, prefix="/api", tags=["tenants"])
 app.include_router(leases.router, prefix="/api", tags=["leases"])
 app.include_router(bills.router, prefix="/api", tags=["bills"])
 app.include_router(my.router, prefix="/api", tags=["my"])
+app.include_router(analytics.router, prefix="/api", tags=["analytics"])
+app.include_router(tariffs.router, prefix="/api", tags=["tariffs"])
+app.include_router(exports.router, prefix="/api", tags=["exports"])
+app.include_router(events.router, prefix="/api", tags=["events"])
 
 # 根路径
 @app.get("/")
@@ -39,4 +95,9 @@ def read_root():
 # 健康检查
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+# Prometheus 指标
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(registry.render_prometheus(), media_type="text/plain; version=0.0.4")
\ No newline at end of file
@@ -0,0 +1,207 @@
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# 同一请求内相同语句执行次数达到该阈值时视为疑似 N+1
+N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", 5))
+# 是否在响应头中附带本次请求的 SQL 统计
+SQL_METRICS_HEADERS = os.getenv("SQL_METRICS_HEADERS", "").lower() in ("1", "true", "yes")
+
+class RequestStats:
+    """单个请求内的 SQL 统计"""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.rows = 0
+        self.pool_wait = 0.0
+        self.statements = {}
+
+    def suspected_n_plus_one(self):
+        """返回执行次数达到阈值的 SELECT 语句"""
+        return [
+            statement for statement, count in self.statements.items()
+            if count >= N_PLUS_ONE_THRESHOLD and statement.lstrip().upper().startswith("SELECT")
+        ]
+
+_current_stats: ContextVar = ContextVar("sql_request_stats", default=None)
+
+class MetricsRegistry:
+    """按路由累计的请求与 SQL 指标，线程安全"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+        self._startup = {}
+
+    def record_startup(self, import_seconds: float, startup_seconds: float):
+        """记录本进程导入应用模块和执行 lifespan 启动的耗时"""
+        with self._lock:
+            self._startup = {"import": import_seconds, "lifespan": startup_seconds}
+
+    def record(self, method: str, route: str, stats: RequestStats, duration: float):
+        with self._lock:
+            entry = self._routes.setdefault((method, route), {
+                "requests": 0,
+                "request_seconds": 0.0,
+                "queries": 0,
+                "db_seconds": 0.0,
+                "rows": 0,
+                "pool_wait_seconds": 0.0,
+                "n_plus_one": 0,
+            })
+            entry["requests"] += 1
+            entry["request_seconds"] += duration
+            entry["queries"] += stats.queries
+            entry["db_seconds"] += stats.db_time
+            entry["rows"] += stats.rows
+            entry["pool_wait_seconds"] += stats.pool_wait
+            if stats.suspected_n_plus_one():
+                entry["n_plus_one"] += 1
+
+    def render_prometheus(self) -> str:
+        """以 Prometheus 文本格式输出全部指标"""
+        metrics = [
+            ("propmanage_http_requests_total", "requests", "counter", "HTTP requests handled"),
+            ("propmanage_http_request_seconds_total", "request_seconds", "counter", "Total request handling time"),
+            ("propmanage_db_queries_total", "queries", "counter", "SQL statements executed"),
+            ("propmanage_db_seconds_total", "db_seconds", "counter", "Total time spent executing SQL"),
+            ("propmanage_db_rows_total", "rows", "counter", "Rows fetched by queries plus rows affected by writes"),
+            ("propmanage_db_pool_wait_seconds_total", "pool_wait_seconds", "counter", "Total time waiting for a pooled connection"),
+            ("propmanage_db_n_plus_one_suspected_total", "n_plus_one", "counter", "Requests flagged as suspected N+1"),
+        ]
+        with self._lock:
+            routes = {key: dict(value) for key, value in self._routes.items()}
+            startup = dict(self._startup)
+
+        lines = []
+        if startup:
+            lines.append("# HELP propmanage_startup_seconds Worker boot time by phase")
+            lines.append("# TYPE propmanage_startup_seconds gauge")
+            for phase, seconds in startup.items():
+                lines.append(f'propmanage_startup_seconds{{phase="{phase}"}} {seconds}')
+        for name, field, metric_type, help_text in metrics:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for (method, route), entry in sorted(routes.items()):
+                lines.append(f'{name}{{method="{method}",route="{route}"}} {entry[field]}')
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+class _CountingCursor:
+    """包装 DBAPI 游标，统计查询实际取回的行数（Core、列查询和 ORM 查询都经过这里）"""
+
+    __slots__ = ("_cursor", "_stats")
+
+    def __init__(self, cursor, stats: RequestStats):
+        self._cursor = cursor
+        self._stats = stats
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._stats.rows += 1
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._stats.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._stats.rows += len(rows)
+        return rows
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+def instrument_engine(engine):
+    """在同步 Engine 上注册 SQL 统计钩子（异步引擎传入 async_engine.sync_engine）"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        stats = _current_stats.get()
+        if stats is None:
+            return
+        stats.queries += 1
+        stats.db_time += elapsed
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            # 查询结果由 SQLAlchemy 从 context.cursor 读取，替换为计数游标以统计取回的行数
+            if context is not None:
+                context.cursor = _CountingCursor(cursor, stats)
+        elif cursor.rowcount > 0:
+            stats.rows += cursor.rowcount
+        stats.statements[statement] = stats.statements.get(statement, 0) + 1
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        # 执行失败时不会触发 after_cursor_execute，清除未弹出的开始时间
+        if exception_context.connection is not None:
+            exception_context.connection.info.pop("query_start_time", None)
+
+    # 连接池没有“开始等待”事件，这里对获取连接的入口计时
+    raw_connection = engine.raw_connection
+
+    def _timed_raw_connection(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return raw_connection(*args, **kwargs)
+        finally:
+            stats = _current_stats.get()
+            if stats is not None:
+                stats.pool_wait += time.perf_counter() - start
+
+    engine.raw_connection = _timed_raw_connection
+
+class SQLMetricsMiddleware:
+    """ASGI 中间件：为每个请求收集 SQL 统计并按路由汇总"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and SQL_METRICS_HEADERS:
+                headers = list(message.get("headers", []))
+                headers += [
+                    (b"x-db-query-count", str(stats.queries).encode()),
+                    (b"x-db-time-ms", f"{stats.db_time * 1000:.2f}".encode()),
+                    (b"x-db-rows", str(stats.rows).encode()),
+                    (b"x-db-pool-wait-ms", f"{stats.pool_wait * 1000:.2f}".encode()),
+                    (b"x-db-n-plus-one", b"true" if stats.suspected_n_plus_one() else b"false"),
+                ]
+                message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_stats.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            registry.record(scope["method"], route_path, stats, time.perf_counter() - start)
+            for statement in stats.suspected_n_plus_one():
+                logger.warning(
+                    "Suspected N+1 on %s %s: %d executions of %s",
+                    scope["method"], route_path, stats.statements[statement], statement
+                )
@@ -3,4 +3,9 @@ from .room import Room
 from .tenant import Tenant
 from .lease import Lease
 from .bill import Bill
+from .bill_archive import BillArchive
+from .billing_summary import BillingSummary
+from .idempotency_key import IdempotencyKey
+from .meter_reading import MeterReading
+from .tariff import Tariff
 from ..database import Base
\ No newline at end of file
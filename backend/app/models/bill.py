@@ -1,9 +1,21 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, Float, Date
+from datetime import date
+from sqlalchemy import Column, Integer, ForeignKey, String, Float, Date, Index, case, literal
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class Bill(Base):
     __tablename__ = "bills"
+    __table_args__ = (
+        # 支持按 (due_date, id) 的游标分页
+        Index("ix_bills_due_date_id", "due_date", "id"),
+        # 支持按状态（含逾期）过滤、计数
+        Index("ix_bills_status_due_date", "status", "due_date"),
+        # 同一合同同一账期只能有一张账单，同时支持按 lease_id 查询
+        Index("uq_bills_lease_id_period", "lease_id", "period", unique=True),
+        # 归档账单保留原 id，SQLite 上不能复用已删除的 id（见 archive_service）
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     lease_id = Column(Integer, ForeignKey("leases.id"))
@@ -11,16 +23,37 @@ class Bill(Base):
     rent_fee = Column(Float)
     water_fee = Column(Float, default=0.0)
     elec_fee = Column(Float, default=0.0)
+    # 本期用量，调整价格后据此重新计费
+    water_usage = Column(Float, default=0.0)
+    elec_usage = Column(Float, default=0.0)
     total_amount = Column(Float)
-    status = Column(String, index=True)  # Pending, Paid
+    status = Column(String)  # Pending, Paid
     due_date = Column(Date)
 
     lease = relationship("Lease", back_populates="bills")
 
+    @hybrid_property
+    def current_status(self):
+        """当前状态（包含逾期判断），不会修改已存储的 status"""
+        if self.status == "Paid":
+            return "Paid"
+        elif date.today() > self.due_date:
+            return "Overdue"
+        else:
+            return "Pending"
+
+    @current_status.expression
+    def current_status(cls):
+        return case(
+            (cls.status == "Paid", literal("Paid")),
+            (cls.due_date < date.today(), literal("Overdue")),
+            else_=literal("Pending"),
+        )
+
     @property
     def room(self):
         return self.lease.room if self.lease else None
 
     @property
     def tenant(self):
-        return self.lease.tenant if self.lease else None
\ No newline at end of file
+        return self.lease.tenant if self.lease else None
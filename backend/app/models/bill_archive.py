@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, ForeignKey, String, Float, Date, Index
+from app.database import Base
+
+class BillArchive(Base):
+    """已归档的已支付账单，列与 bills 相同，保留原账单 id"""
+    __tablename__ = "bills_archive"
+    __table_args__ = (
+        # 按合同/租客查询历史账单
+        Index("ix_bills_archive_lease_id_period", "lease_id", "period"),
+        # 按账期范围查询、按 (due_date, id) 分页
+        Index("ix_bills_archive_period", "period"),
+        Index("ix_bills_archive_due_date_id", "due_date", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    lease_id = Column(Integer, ForeignKey("leases.id"))
+    period = Column(String)
+    rent_fee = Column(Float)
+    water_fee = Column(Float)
+    elec_fee = Column(Float)
+    water_usage = Column(Float)
+    elec_usage = Column(Float)
+    total_amount = Column(Float)
+    status = Column(String)
+    due_date = Column(Date)
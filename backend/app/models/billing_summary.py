@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, ForeignKey, String, Float, Date
+from app.database import Base
+
+class BillingSummary(Base):
+    """按楼宇、账期汇总的账单金额，随账单写入在同一事务内增量维护"""
+    __tablename__ = "billing_summary"
+
+    building_id = Column(Integer, ForeignKey("buildings.id"), primary_key=True)
+    period = Column(String, primary_key=True)  # e.g., "2023-10"
+    # 同一账期的账单截止日可能不同，按截止日拆分以便在读取时判断逾期
+    due_date = Column(Date, primary_key=True)
+    bill_count = Column(Integer, default=0)
+    billed_amount = Column(Float, default=0.0)
+    collected_amount = Column(Float, default=0.0)
+    outstanding_amount = Column(Float, default=0.0)
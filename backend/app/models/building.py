@@ -1,9 +1,14 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class Building(Base):
     __tablename__ = "buildings"
+    __table_args__ = (
+        # 楼宇名称的子串搜索
+        Index("ix_buildings_name_trgm", "name", postgresql_using="gin",
+              postgresql_ops={"name": "gin_trgm_ops"}, info={"postgresql_only": True}),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
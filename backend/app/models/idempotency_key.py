@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from app.database import Base
+
+class IdempotencyKey(Base):
+    """带 Idempotency-Key 的写请求的已保存响应，重试时直接返回"""
+    __tablename__ = "idempotency_keys"
+
+    tenant_id = Column(Integer, primary_key=True)
+    key = Column(String, primary_key=True)
+    # 同一个键只能用于同一个请求（如 "pay:42"）
+    request = Column(String)
+    status_code = Column(Integer)
+    response_body = Column(Text)
+    created_at = Column(DateTime)
@@ -1,12 +1,19 @@
-from sqlalchemy import Column, Integer, ForeignKey, Date, Float, String
+from sqlalchemy import Column, Integer, ForeignKey, Date, Float, String, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class Lease(Base):
     __tablename__ = "leases"
+    __table_args__ = (
+        # 租客查询自己的有效合同
+        Index("ix_leases_tenant_id_status", "tenant_id", "status"),
+        # 按房间查找与某时间段重叠的合同（end_date > 开始日期），见 app.services.availability_service
+        # PostgreSQL 上另有排他约束 ex_leases_room_id_period，禁止同一房间的有效合同时间段重叠（见迁移 0008）
+        Index("ix_leases_room_id_end_date", "room_id", "end_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    room_id = Column(Integer, ForeignKey("rooms.id"))
+    room_id = Column(Integer, ForeignKey("rooms.id"), index=True)
     tenant_id = Column(Integer, ForeignKey("tenants.id"))
     start_date = Column(Date)
     end_date = Column(Date)
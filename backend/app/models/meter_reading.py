@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, ForeignKey, String, Float, DateTime, Index
+from app.database import Base
+
+class MeterReading(Base):
+    """水电表读数历史，只追加不修改
+
+    主键 (room_id, read_at) 使同一房间的读数按时间聚簇，按房间的区间查询只需扫描主键范围。
+    building_id 和 period 冗余存储，按楼宇、账期统计时无需关联其他表。
+    """
+    __tablename__ = "meter_readings"
+    __table_args__ = (
+        # 按楼宇的时间区间查询
+        Index("ix_meter_readings_building_id_read_at", "building_id", "read_at"),
+        # 按时间顺序追加写入，PostgreSQL 上使用体积很小的 BRIN 索引
+        Index("ix_meter_readings_read_at", "read_at", postgresql_using="brin"),
+    )
+
+    room_id = Column(Integer, ForeignKey("rooms.id"), primary_key=True)
+    read_at = Column(DateTime, primary_key=True)
+    building_id = Column(Integer, ForeignKey("buildings.id"))
+    # 账单可能被归档，这里不设外键
+    bill_id = Column(Integer)
+    period = Column(String)  # 读数对应的账期，e.g., "2023-10"
+    water_reading = Column(Float)
+    elec_reading = Column(Float)
+    # 与上一次读数的差值
+    water_usage = Column(Float)
+    elec_usage = Column(Float)
@@ -1,9 +1,16 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class Room(Base):
     __tablename__ = "rooms"
+    __table_args__ = (
+        # 按楼宇统计/筛选房间状态
+        Index("ix_rooms_building_id_status", "building_id", "status"),
+        # 房间号的前缀和子串搜索，SQLite 上使用 FTS5 trigram 索引
+        Index("ix_rooms_room_number_trgm", "room_number", postgresql_using="gin",
+              postgresql_ops={"room_number": "gin_trgm_ops"}, info={"postgresql_only": True}),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     building_id = Column(Integer, ForeignKey("buildings.id"))
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, ForeignKey, String, Date, JSON, Index
+from app.database import Base
+
+class Tariff(Base):
+    """水电阶梯价格表，按楼宇和生效日期区分
+
+    building_id 为空表示默认价格；楼宇有自己的价格表时优先使用。
+    tiers 为按 up_to 升序排列的阶梯，如 [{"up_to": 10, "unit_price": 5.0}, {"up_to": null, "unit_price": 7.0}]，
+    最后一档 up_to 为 null 表示不设上限。
+    """
+    __tablename__ = "tariffs"
+    __table_args__ = (
+        Index("ix_tariffs_building_id_utility_effective_from", "building_id", "utility", "effective_from"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    building_id = Column(Integer, ForeignKey("buildings.id"), nullable=True)
+    utility = Column(String)  # water, elec
+    effective_from = Column(Date)
+    tiers = Column(JSON)
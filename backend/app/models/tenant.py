@@ -1,9 +1,16 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class Tenant(Base):
     __tablename__ = "tenants"
+    __table_args__ = (
+        # 姓名/电话的前缀和子串搜索，SQLite 上使用 FTS5 trigram 索引（见 app.services.search_service）
+        Index("ix_tenants_name_trgm", "name", postgresql_using="gin",
+              postgresql_ops={"name": "gin_trgm_ops"}, info={"postgresql_only": True}),
+        Index("ix_tenants_phone_trgm", "phone", postgresql_using="gin",
+              postgresql_ops={"phone": "gin_trgm_ops"}, info={"postgresql_only": True}),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
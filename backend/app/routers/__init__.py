@@ -2,4 +2,9 @@ from .buildings import router as buildings_router
 from .tenants import router as tenants_router
 from .leases import router as leases_router
 from .bills import router as bills_router
-from .my import router as my_router
\ No newline at end of file
+from .my import router as my_router
+from .analytics import router as analytics_router
+from .tariffs import router as tariffs_router
+from .exports import router as exports_router
+from .rooms import router as rooms_router
+from .events import router as events_router
\ No newline at end of file
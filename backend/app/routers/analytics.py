@@ -0,0 +1,107 @@
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
+from sqlalchemy import func, case, select
+from sqlalchemy.orm import Session
+from app import models, schemas
+from app.database import get_db
+from app.serializers import response_columns, encode_rows, json_response
+from app.services.consumption_service import (
+    CONSUMPTION_GROUPS, reading_conditions, consumption_query, anomaly_query
+)
+
+router = APIRouter()
+
+def get_landlord_role(x_role: str = Header(None)):
+    """验证房东身份"""
+    if x_role != "landlord":
+        raise HTTPException(status_code=403, detail="Forbidden: Landlord access required")
+    return x_role
+
+@router.get("/analytics/billing", response_model=list[schemas.BillingSummaryResponse])
+def get_billing_analytics(
+    building_id: int = None,
+    period_from: str = None,
+    period_to: str = None,
+    db: Session = Depends(get_db),
+    x_role: str = Depends(get_landlord_role)
+):
+    """按楼宇、账期统计应收、已收、待收和逾期金额（房东权限），直接读取 billing_summary"""
+    summary = models.BillingSummary
+    query = db.query(
+        summary.building_id,
+        summary.period,
+        func.sum(summary.bill_count).label("bill_count"),
+        func.sum(summary.billed_amount).label("billed_amount"),
+        func.sum(summary.collected_amount).label("collected_amount"),
+        func.sum(summary.outstanding_amount).label("outstanding_amount"),
+        func.sum(case((summary.due_date < date.today(), summary.outstanding_amount), else_=0.0)).label("overdue_amount"),
+    )
+
+    if building_id:
+        query = query.filter(summary.building_id == building_id)
+    if period_from:
+        query = query.filter(summary.period >= period_from)
+    if period_to:
+        query = query.filter(summary.period <= period_to)
+
+    rows = query.group_by(summary.building_id, summary.period) \
+        .order_by(summary.building_id, summary.period).all()
+    return [row._asdict() for row in rows]
+
+@router.get("/analytics/meter-readings", response_model=list[schemas.MeterReadingResponse])
+def get_meter_readings(
+    room_id: int = None,
+    building_id: int = None,
+    date_from: date = None,
+    date_to: date = None,
+    db: Session = Depends(get_db),
+    x_role: str = Depends(get_landlord_role)
+):
+    """按房间或楼宇查询时间区间内的读数历史（房东权限）"""
+    if not room_id and not building_id:
+        raise HTTPException(status_code=400, detail="room_id or building_id is required")
+    reading = models.MeterReading
+    rows = db.execute(
+        select(*response_columns(schemas.MeterReadingResponse, reading))
+        .filter(*reading_conditions(building_id, room_id, date_from, date_to))
+        .order_by(reading.room_id, reading.read_at)
+    ).mappings().all()
+    return json_response(encode_rows(rows))
+
+@router.get("/analytics/consumption", response_model=list[schemas.ConsumptionRow])
+def get_consumption(
+    group_by: str = "building,period",
+    room_id: int = None,
+    building_id: int = None,
+    date_from: date = None,
+    date_to: date = None,
+    db: Session = Depends(get_db),
+    x_role: str = Depends(get_landlord_role)
+):
+    """按房间、楼宇、账期（group_by，逗号分隔）汇总用水、用电量（房东权限）"""
+    groups = [name.strip() for name in group_by.split(",") if name.strip()]
+    unknown = [name for name in groups if name not in CONSUMPTION_GROUPS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown group_by: {', '.join(unknown)}")
+    conditions = reading_conditions(building_id, room_id, date_from, date_to)
+    return [row._asdict() for row in db.execute(consumption_query(groups, conditions))]
+
+@router.get("/analytics/consumption/anomalies", response_model=list[schemas.ConsumptionAnomaly])
+def get_consumption_anomalies(
+    room_id: int = None,
+    building_id: int = None,
+    date_from: date = None,
+    date_to: date = None,
+    window: int = Query(6, ge=1, le=24),
+    factor: float = Query(2.0, gt=1.0),
+    db: Session = Depends(get_db),
+    x_role: str = Depends(get_landlord_role)
+):
+    """标记用量超过此前 window 次读数平均值 factor 倍的读数（房东权限）
+
+    窗口函数需扫描范围内的全部读数，因此必须按房间、楼宇或完整的日期区间限定范围。
+    """
+    if not room_id and not building_id and not (date_from and date_to):
+        raise HTTPException(status_code=400, detail="room_id, building_id or date_from and date_to is required")
+    query = anomaly_query(building_id, room_id, date_from, date_to, window, factor)
+    return [row._asdict() for row in db.execute(query)]
@@ -1,8 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 from app import models, schemas
-from app.database import get_db
-from app.services.bill_service import update_bill_with_meter_reading, get_bill_status
+from app.database import get_db, get_async_db, SessionLocal
+from app.cache import response_cache
+from app.serializers import response_columns, encode_rows, json_response
+from app.services.bill_service import (
+    update_bill_with_meter_reading, bill_response_columns, bill_status_clause, bill_period_clauses,
+    parse_meter_reading_rows, apply_meter_readings_bulk
+)
+from app.services.archive_service import wants_archive
 
 router = APIRouter()
 
@@ -12,44 +23,121 @@ def get_landlord_role(x_role: str = Header(None)):
         raise HTTPException(status_code=403, detail="Forbidden: Landlord access required")
     return x_role
 
+# 流式导出时每批从数据库拉取的行数
+STREAM_CHUNK_SIZE = 500
+
+# 列表接口只查询 BillResponse 需要的列；当前账单的列含逾期判断，由 bill_response_columns 每次构建
+# 归档账单均为已支付，直接使用存储的 status
+ARCHIVED_BILL_RESPONSE_COLUMNS = response_columns(schemas.BillResponse, models.BillArchive)
+
+# 账期参数格式 YYYY-MM
+PERIOD_PATTERN = r"^\d{4}-\d{2}$"
+
+def _filter_bills(
+    query,
+    status: str = None,
+    building_id: int = None,
+    period_from: str = None,
+    period_to: str = None,
+    model=models.Bill,
+):
+    """按状态、楼宇和账期范围过滤账单查询，model 为 Bill 或 BillArchive"""
+    if status:
+        query = query.filter(bill_status_clause(status, model))
+
+    query = query.filter(*bill_period_clauses(period_from, period_to, model))
+
+    if building_id:
+        query = query.join(models.Lease, model.lease_id == models.Lease.id) \
+            .join(models.Room).filter(models.Room.building_id == building_id)
+
+    return query
+
+def encode_cursor(bill) -> str:
+    """将账单的 (due_date, id) 编码为游标"""
+    return f"{bill['due_date'].isoformat()},{bill['id']}"
+
+def decode_cursor(cursor: str):
+    """解析游标，返回 (due_date, id)"""
+    try:
+        due_date, bill_id = cursor.split(",")
+        return date.fromisoformat(due_date), int(bill_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 @router.get("/bills", response_model=list[schemas.BillResponse])
-def get_bills(
+async def get_bills(
     status: str = None,
     building_id: int = None,
-    db: Session = Depends(get_db),
+    period_from: str = Query(None, pattern=PERIOD_PATTERN),
+    period_to: str = Query(None, pattern=PERIOD_PATTERN),
+    limit: int = Query(None, ge=1, le=1000),
+    cursor: str = None,
+    db: AsyncSession = Depends(get_async_db),
     x_role: str = Depends(get_landlord_role)
 ):
-    """获取账单列表（房东权限）"""
-    query = db.query(models.Bill).options(
-        joinedload(models.Bill.lease).joinedload(models.Lease.room),
-        joinedload(models.Bill.lease).joinedload(models.Lease.tenant)
-    )
+    """获取账单列表（房东权限）
 
-    if status:
-        query = query.filter(models.Bill.status == status)
+    传入 limit 时按 (due_date, id) 游标分页，下一页游标通过 X-Next-Cursor 响应头返回。
+    账期范围涉及归档分界之前的账期时，同时查询 bills_archive 中的归档账单。
+    """
+    query = _filter_bills(select(*bill_response_columns()), status, building_id, period_from, period_to)
+    due_date, bill_id = models.Bill.due_date, models.Bill.id
+    if wants_archive(period_from, period_to):
+        archived = _filter_bills(
+            select(*ARCHIVED_BILL_RESPONSE_COLUMNS), status, building_id, period_from, period_to, models.BillArchive
+        )
+        bills = union_all(query, archived).subquery()
+        query = select(bills)
+        due_date, bill_id = bills.c.due_date, bills.c.id
 
-    if building_id:
-        query = query.join(models.Lease).join(models.Room).filter(models.Room.building_id == building_id)
+    headers = {}
+    if limit is not None:
+        query = query.order_by(due_date, bill_id)
+        if cursor:
+            query = query.filter(tuple_(due_date, bill_id) > decode_cursor(cursor))
+        # 多取一行用于判断是否还有下一页
+        bills = (await db.execute(query.limit(limit + 1))).mappings().all()
+        if len(bills) > limit:
+            bills = bills[:limit]
+            headers["X-Next-Cursor"] = encode_cursor(bills[-1])
+    else:
+        bills = (await db.execute(query)).mappings().all()
 
-    bills = query.all()
+    return json_response(encode_rows(bills), headers)
 
-    # 添加状态信息
-    for bill in bills:
-        bill.status = get_bill_status(bill)
+@router.get("/bills/stream")
+def stream_bills(
+    status: str = None,
+    building_id: int = None,
+    x_role: str = Depends(get_landlord_role)
+):
+    """以 NDJSON 流式返回账单（房东权限），内存占用与账单总数无关"""
+    def generate():
+        # 使用独立会话，保证在整个响应流结束前连接可用
+        db = SessionLocal()
+        try:
+            query = _filter_bills(db.query(models.Bill), status, building_id)
+            query = query.order_by(models.Bill.due_date, models.Bill.id).yield_per(STREAM_CHUNK_SIZE)
+            for bill in query:
+                item = schemas.BillResponse.model_validate(bill, from_attributes=True)
+                yield item.model_dump_json() + "\n"
+                # 释放已输出的对象，避免会话身份映射持续增长
+                db.expunge(bill)
+        finally:
+            db.close()
 
-    return bills
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 @router.get("/bills/{bill_id}", response_model=schemas.BillResponse)
 def get_bill(bill_id: int, db: Session = Depends(get_db), x_role: str = Depends(get_landlord_role)):
-    """获取单个账单（房东权限）"""
+    """获取单个账单（房东权限），在线账单中没有时查询归档账单"""
     bill = db.query(models.Bill).options(
         joinedload(models.Bill.lease).joinedload(models.Lease.room),
         joinedload(models.Bill.lease).joinedload(models.Lease.tenant)
-    ).filter(models.Bill.id == bill_id).first()
+    ).filter(models.Bill.id == bill_id).first() or db.get(models.BillArchive, bill_id)
     if not bill:
         raise HTTPException(status_code=404, detail="Bill not found")
-
-    bill.status = get_bill_status(bill)
     return bill
 
 @router.post("/bills/{bill_id}/meter-reading", response_model=schemas.BillResponse)
@@ -69,8 +157,28 @@ def add_meter_reading(
         )
         if not updated_bill:
             raise HTTPException(status_code=404, detail="Bill not found")
-
-        updated_bill.status = get_bill_status(updated_bill)
+        # 账单金额和房间读数均有变化
+        response_cache.invalidate("leases", "buildings")
         return updated_bill
     except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/bills/meter-readings", response_model=schemas.MeterReadingBulkResult)
+async def add_meter_readings_bulk(
+    request: Request,
+    building_id: int = None,
+    period: str = None,
+    db: Session = Depends(get_db),
+    x_role: str = Depends(get_landlord_role)
+):
+    """批量录入水电表读数（房东权限），请求体为 CSV 或 NDJSON，返回逐行错误报告"""
+    body = await request.body()
+    try:
+        rows = parse_meter_reading_rows(body, request.headers.get("content-type", ""))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # 数据库操作是阻塞的，放到线程池执行
+    result = await run_in_threadpool(apply_meter_readings_bulk, db, rows, building_id, period)
+    if result["updated"]:
+        response_cache.invalidate("leases", "buildings")
+    return result
\ No newline at end of file
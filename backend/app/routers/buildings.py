@@ -1,23 +1,67 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import func, case
+from sqlalchemy.orm import Session, selectinload
 from app import models, schemas
 from app.database import get_db
+from app.cache import response_cache
 
 router = APIRouter()
 
 @router.get("/buildings", response_model=list[schemas.BuildingResponse])
-def get_buildings(db: Session = Depends(get_db)):
+def get_buildings(request: Request, db: Session = Depends(get_db)):
     """获取所有楼宇及旗下房间"""
-    buildings = db.query(models.Building).all()
-    return buildings
+    cache_key = response_cache.key_for(request, ["buildings"])
+    cached = response_cache.lookup(request, cache_key)
+    if cached:
+        return cached
+
+    buildings = db.query(models.Building).options(selectinload(models.Building.rooms)).all()
+    return response_cache.store(request, cache_key, list[schemas.BuildingResponse], buildings)
+
+@router.get("/buildings/summary", response_model=list[schemas.BuildingSummary])
+def get_buildings_summary(db: Session = Depends(get_db)):
+    """获取各楼宇的房间状态统计、出租率和已出租面积（单次聚合查询）"""
+    Room = models.Room
+    rows = db.query(
+        models.Building.id,
+        models.Building.name,
+        func.count(Room.id).label("total_rooms"),
+        func.sum(case((Room.status == "Vacant", 1), else_=0)).label("vacant_rooms"),
+        func.sum(case((Room.status == "Occupied", 1), else_=0)).label("occupied_rooms"),
+        func.sum(case((Room.status == "Maintenance", 1), else_=0)).label("maintenance_rooms"),
+        func.sum(case((Room.status == "Occupied", Room.area), else_=0)).label("leased_area"),
+    ).outerjoin(Room, Room.building_id == models.Building.id) \
+        .group_by(models.Building.id, models.Building.name) \
+        .order_by(models.Building.id).all()
+
+    return [
+        schemas.BuildingSummary(
+            building_id=row.id,
+            name=row.name,
+            total_rooms=row.total_rooms,
+            vacant_rooms=row.vacant_rooms or 0,
+            occupied_rooms=row.occupied_rooms or 0,
+            maintenance_rooms=row.maintenance_rooms or 0,
+            occupancy_rate=(row.occupied_rooms or 0) / row.total_rooms if row.total_rooms else 0.0,
+            leased_area=row.leased_area or 0.0,
+        )
+        for row in rows
+    ]
 
 @router.get("/buildings/{building_id}", response_model=schemas.BuildingResponse)
-def get_building(building_id: int, db: Session = Depends(get_db)):
+def get_building(building_id: int, request: Request, db: Session = Depends(get_db)):
     """获取单个楼宇及旗下房间"""
-    building = db.query(models.Building).filter(models.Building.id == building_id).first()
+    cache_key = response_cache.key_for(request, ["buildings"])
+    cached = response_cache.lookup(request, cache_key)
+    if cached:
+        return cached
+
+    building = db.query(models.Building).options(
+        selectinload(models.Building.rooms)
+    ).filter(models.Building.id == building_id).first()
     if not building:
         raise HTTPException(status_code=404, detail="Building not found")
-    return building
+    return response_cache.store(request, cache_key, schemas.BuildingResponse, building)
 
 @router.post("/buildings", response_model=schemas.BuildingResponse)
 def create_building(building: schemas.BuildingCreate, db: Session = Depends(get_db)):
@@ -26,4 +70,5 @@ def create_building(building: schemas.BuildingCreate, db: Session = Depends(get_
     db.add(db_building)
     db.commit()
     db.refresh(db_building)
+    response_cache.invalidate("buildings")
     return db_building
\ No newline at end of file
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, HTTPException, Header
+from fastapi.responses import StreamingResponse
+from app.events import change_feed
+
+router = APIRouter()
+
+@router.get("/events")
+async def stream_events(building_id: int = None, x_role: str = Header(None), x_tenant_id: str = Header(None)):
+    """以 SSE 推送账单和合同变更事件
+
+    房东（X-Role: landlord）接收全部事件，可用 building_id 只接收某栋楼的事件；
+    租客（X-Tenant-Id）只接收自己的事件。事件类型为 bill.paid、bill.metered、lease.created，
+    收到 resync 时说明可能漏掉了事件，应重新加载列表。连接不占用数据库连接。
+    """
+    if x_role == "landlord":
+        subscription = change_feed.subscribe(building_id=building_id)
+    elif x_tenant_id:
+        try:
+            tenant_id = int(x_tenant_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="X-Tenant-Id must be an integer")
+        subscription = change_feed.subscribe(tenant_id=tenant_id)
+    else:
+        raise HTTPException(status_code=400, detail="X-Role: landlord or X-Tenant-Id header is required")
+
+    return StreamingResponse(
+        change_feed.stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,81 @@
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
+from fastapi.responses import StreamingResponse
+from app.database import SessionLocal
+from app.exporters import EXPORT_FORMATS
+from app.services.archive_service import wants_archive
+from app.services.export_service import bill_export_query, lease_export_query
+
+router = APIRouter()
+
+def get_landlord_role(x_role: str = Header(None)):
+    """验证房东身份"""
+    if x_role != "landlord":
+        raise HTTPException(status_code=403, detail="Forbidden: Landlord access required")
+    return x_role
+
+# 每批从服务端游标拉取的行数
+EXPORT_CHUNK_SIZE = 2000
+PERIOD_PATTERN = r"^\d{4}-\d{2}$"
+FORMAT_PATTERN = "^(" + "|".join(EXPORT_FORMATS) + ")$"
+
+def stream_export(query, export_format: str, filename: str, sheet_name: str) -> StreamingResponse:
+    """以 CSV 或 XLSX 流式输出查询结果
+
+    表头在执行查询前发出；查询使用 yield_per（PostgreSQL 上为服务端游标）分批读取，
+    内存占用与导出行数无关。
+    """
+    encode, media_type = EXPORT_FORMATS[export_format]
+    header = [column.key for column in query.selected_columns]
+
+    def partitions(db):
+        result = db.execute(query.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+        yield from result.partitions()
+
+    def generate():
+        # 使用独立会话，保证在整个响应流结束前连接可用
+        db = SessionLocal()
+        try:
+            if export_format == "xlsx":
+                yield from encode(header, partitions(db), sheet_name)
+            else:
+                yield from encode(header, partitions(db))
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        generate(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'}
+    )
+
+@router.get("/export/bills")
+def export_bills(
+    format: str = Query("csv", pattern=FORMAT_PATTERN),
+    period: str = Query(None, pattern=PERIOD_PATTERN),
+    period_from: str = Query(None, pattern=PERIOD_PATTERN),
+    period_to: str = Query(None, pattern=PERIOD_PATTERN),
+    status: str = None,
+    building_id: int = None,
+    x_role: str = Depends(get_landlord_role)
+):
+    """导出账单（房东权限），period 为单个账期，等同于 period_from = period_to = period
+
+    账期范围涉及归档分界之前的账期时同时导出归档账单。
+    """
+    if period:
+        period_from = period_to = period
+    query = bill_export_query(
+        status, building_id, period_from, period_to, include_archive=wants_archive(period_from, period_to)
+    )
+    filename = "bills-" + (period or "-".join(filter(None, (period_from, period_to))) or "all")
+    return stream_export(query, format, filename, "Bills")
+
+@router.get("/export/leases")
+def export_leases(
+    format: str = Query("csv", pattern=FORMAT_PATTERN),
+    status: str = None,
+    building_id: int = None,
+    x_role: str = Depends(get_landlord_role)
+):
+    """导出合同及租客信息（房东权限）"""
+    return stream_export(lease_export_query(status, building_id), format, "leases", "Leases")
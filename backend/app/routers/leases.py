@@ -1,48 +1,156 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from app import models, schemas
-from app.database import get_db
-from app.services.bill_service import generate_bills_for_lease
+from app.database import get_db, get_async_db
+from app.cache import response_cache
+from app.events import change_feed
+from app.serializers import (
+    response_columns, nest_prefixed, embed_children, encode_rows, encode_row, json_response
+)
+from app.services.bill_service import generate_bills_for_lease, bill_response_columns
+from app.services.lease_service import parse_lease_rows, bulk_create_leases, lease_created_event
+from app.services.availability_service import find_conflicts, occupied_on
 
 router = APIRouter()
 
+# 可通过 fields 选择的合同字段（id 始终返回）
+LEASE_FIELDS = tuple(name for name in schemas.LeaseResponse.model_fields if name != "bills")
+# 可通过 include 嵌入的关联数据：房间和租客为多对一外连接，账单单独查询
+LEASE_INCLUDES = {
+    "room": (schemas.RoomResponse, models.Room, models.Lease.room_id),
+    "tenant": (schemas.TenantResponse, models.Tenant, models.Lease.tenant_id),
+    "bills": None,
+}
+DEFAULT_LEASE_INCLUDE = "room,tenant"
+
 def get_landlord_role(x_role: str = Header(None)):
     """验证房东身份"""
     if x_role != "landlord":
         raise HTTPException(status_code=403, detail="Forbidden: Landlord access required")
     return x_role
 
-@router.get("/leases", response_model=list[schemas.LeaseResponse])
-def get_leases(db: Session = Depends(get_db), x_role: str = Depends(get_landlord_role)):
-    """获取所有合同（房东权限）"""
-    leases = db.query(models.Lease).options(
-        joinedload(models.Lease.room),
-        joinedload(models.Lease.tenant),
-        joinedload(models.Lease.bills)
-    ).all()
-    return leases
-
-@router.get("/leases/{lease_id}", response_model=schemas.LeaseResponse)
-def get_lease(lease_id: int, db: Session = Depends(get_db), x_role: str = Depends(get_landlord_role)):
-    """获取单个合同（房东权限）"""
-    lease = db.query(models.Lease).options(
-        joinedload(models.Lease.room),
-        joinedload(models.Lease.tenant),
-        joinedload(models.Lease.bills)
-    ).filter(models.Lease.id == lease_id).first()
-    if not lease:
+def parse_csv_param(value: str, allowed, name: str) -> list:
+    """解析逗号分隔的查询参数，出现未知取值时返回 400"""
+    items = [item.strip() for item in (value or "").split(",") if item.strip()]
+    unknown = [item for item in items if item not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown {name}: {', '.join(unknown)}")
+    return items
+
+def build_lease_query(fields: list, include: list):
+    """只查询所需的合同列，并外连接需要嵌入的房间、租客列"""
+    selected = set(fields or LEASE_FIELDS) | {"id"}
+    query = select(*response_columns(schemas.LeaseResponse, models.Lease, fields=selected))
+    for name in include:
+        if LEASE_INCLUDES[name] is None:
+            continue
+        schema, model, foreign_key = LEASE_INCLUDES[name]
+        query = query.add_columns(*response_columns(schema, model, prefix=f"{name}__"))
+        query = query.outerjoin(model, foreign_key == model.id)
+    return query
+
+async def load_leases(db: AsyncSession, query, include: list, lease_ids=None) -> list:
+    """执行合同查询，按 include 嵌入关联数据
+
+    lease_ids 为 None 时表示查询全部合同，账单不再按合同 ID 过滤。
+    """
+    nested = [name for name in include if LEASE_INCLUDES[name] is not None]
+    leases = [nest_prefixed(row, nested) for row in (await db.execute(query)).mappings()]
+    if "bills" not in include:
+        return leases
+    bill_query = select(*bill_response_columns()).order_by(models.Bill.lease_id, models.Bill.id)
+    if lease_ids is not None:
+        bill_query = bill_query.filter(models.Bill.lease_id.in_(lease_ids))
+    bills = (await db.execute(bill_query)).mappings().all()
+    return embed_children(leases, bills, "lease_id", "bills")
+
+@router.get("/leases", response_model=list[schemas.LeaseDetail])
+async def get_leases(
+    request: Request,
+    include: str = DEFAULT_LEASE_INCLUDE,
+    fields: str = None,
+    limit: int = Query(None, ge=1, le=1000),
+    cursor: int = None,
+    db: AsyncSession = Depends(get_async_db),
+    x_role: str = Depends(get_landlord_role)
+):
+    """获取合同列表（房东权限）
+
+    include 指定嵌入的关联数据（room、tenant、bills，默认 room,tenant），
+    fields 指定返回的合同字段（逗号分隔，默认全部）。
+    传入 limit 时按 id 游标分页，下一页游标通过 X-Next-Cursor 响应头返回。
+    """
+    include = parse_csv_param(include, LEASE_INCLUDES, "include")
+    fields = parse_csv_param(fields, LEASE_FIELDS, "fields")
+    query = build_lease_query(fields, include).order_by(models.Lease.id)
+
+    if limit is not None:
+        # 分页请求数据量小，不走响应缓存
+        if cursor is not None:
+            query = query.filter(models.Lease.id > cursor)
+        # 先取出本页合同 ID（多取一条用于判断是否还有下一页），账单只查询本页合同的
+        lease_ids = (await db.scalars(query.with_only_columns(models.Lease.id).limit(limit + 1))).all()
+        headers = {}
+        if len(lease_ids) > limit:
+            lease_ids = lease_ids[:limit]
+            headers["X-Next-Cursor"] = str(lease_ids[-1])
+        leases = await load_leases(db, query.filter(models.Lease.id.in_(lease_ids)), include, lease_ids)
+        return json_response(encode_rows(leases), headers)
+
+    cache_key = response_cache.key_for(request, ["leases"])
+    cached = response_cache.lookup(request, cache_key)
+    if cached:
+        return cached
+    leases = await load_leases(db, query, include)
+    return response_cache.store_body(request, cache_key, encode_rows(leases))
+
+@router.get("/leases/{lease_id}", response_model=schemas.LeaseDetail)
+async def get_lease(
+    lease_id: int,
+    include: str = DEFAULT_LEASE_INCLUDE,
+    fields: str = None,
+    db: AsyncSession = Depends(get_async_db),
+    x_role: str = Depends(get_landlord_role)
+):
+    """获取单个合同（房东权限），include 和 fields 的含义同合同列表"""
+    include = parse_csv_param(include, LEASE_INCLUDES, "include")
+    fields = parse_csv_param(fields, LEASE_FIELDS, "fields")
+    query = build_lease_query(fields, include).filter(models.Lease.id == lease_id)
+    leases = await load_leases(db, query, include, [lease_id])
+    if not leases:
         raise HTTPException(status_code=404, detail="Lease not found")
-    return lease
+    return json_response(encode_row(leases[0]))
+
+@router.post("/leases/bulk", response_model=schemas.LeaseBulkResult)
+async def create_leases_bulk(request: Request, db: Session = Depends(get_db), x_role: str = Depends(get_landlord_role)):
+    """批量导入合同（房东权限），请求体为 JSON 数组或 CSV，返回逐行错误报告"""
+    body = await request.body()
+    try:
+        rows = parse_lease_rows(body, request.headers.get("content-type", ""))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # 数据库操作是阻塞的，放到线程池执行
+    result = await run_in_threadpool(bulk_create_leases, db, rows)
+    if result["created"]:
+        response_cache.invalidate("leases", "buildings")
+    return result
 
 @router.post("/leases", response_model=schemas.LeaseResponse)
 def create_lease(lease: schemas.LeaseCreate, db: Session = Depends(get_db), x_role: str = Depends(get_landlord_role)):
-    """创建新合同并自动生成账单（房东权限）"""
-    # 验证房间是否存在且为空置
-    room = db.query(models.Room).filter(models.Room.id == lease.room_id).first()
+    """创建新合同并自动生成账单（房东权限）
+
+    房间在合同期内不能有其他有效合同，可以为当前已出租的房间签订之后开始的合同。
+    """
+    # 验证房间是否存在且不在维修中，锁定房间防止并发签约
+    room = db.query(models.Room).filter(models.Room.id == lease.room_id).with_for_update().first()
     if not room:
         raise HTTPException(status_code=404, detail="Room not found")
-    if room.status != "Vacant":
-        raise HTTPException(status_code=400, detail="Room is not vacant")
+    if room.status == "Maintenance":
+        raise HTTPException(status_code=400, detail="Room is under maintenance")
 
     # 验证租客是否存在
     tenant = db.query(models.Tenant).filter(models.Tenant.id == lease.tenant_id).first()
@@ -53,18 +161,29 @@ def create_lease(lease: schemas.LeaseCreate, db: Session = Depends(get_db), x_ro
     if lease.end_date <= lease.start_date:
         raise HTTPException(status_code=400, detail="End date must be after start date")
 
-    # 创建合同
+    # 验证合同期与已有合同不重叠
+    if find_conflicts(db, lease.room_id, lease.start_date, lease.end_date):
+        raise HTTPException(status_code=400, detail="Room is already leased for an overlapping period")
+
+    # 创建合同；PostgreSQL 上的排他约束兜底拦截并发写入的重叠合同
     db_lease = models.Lease(**lease.dict(), status="Active")
     db.add(db_lease)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Room is already leased for an overlapping period")
     db.refresh(db_lease)
 
     # 生成账单
     generate_bills_for_lease(db, db_lease)
 
-    # 更新房间状态为已租
-    room.status = "Occupied"
+    # 合同当前生效时更新房间状态为已租
+    if occupied_on(lease.start_date, lease.end_date):
+        room.status = "Occupied"
+    change_feed.publish(db, [lease_created_event(db_lease.id, lease, room.building_id)])
     db.commit()
+    response_cache.invalidate("leases", "buildings")
 
     db.refresh(db_lease)
     return db_lease
\ No newline at end of file
@@ -1,11 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Response
+from sqlalchemy import select, func, case, and_, true, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 from app import models, schemas
-from app.database import get_db
-from app.services.bill_service import pay_bill, get_bill_status
+from app.database import get_db, get_async_db
+from app.cache import response_cache
+from app.serializers import response_columns, encode_rows, encode_row, json_response
+from app.services.bill_service import pay_bill, bill_response_columns, bill_period_clauses
+from app.services.archive_service import wants_archive
+from app.services.idempotency import get_stored_response, store_response
 
 router = APIRouter()
 
+ARCHIVED_BILL_RESPONSE_COLUMNS = response_columns(schemas.BillResponse, models.BillArchive)
+PERIOD_PATTERN = r"^\d{4}-\d{2}$"
+
 def get_tenant_id(x_tenant_id: str = Header(None)):
     """从请求头获取租客ID"""
     if not x_tenant_id:
@@ -16,47 +26,127 @@ def get_tenant_id(x_tenant_id: str = Header(None)):
         raise HTTPException(status_code=400, detail="X-Tenant-Id must be an integer")
 
 @router.get("/my/lease", response_model=schemas.LeaseResponse)
-def get_my_lease(tenant_id: int = Depends(get_tenant_id), db: Session = Depends(get_db)):
+async def get_my_lease(tenant_id: int = Depends(get_tenant_id), db: AsyncSession = Depends(get_async_db)):
     """获取当前租客的有效合同"""
-    lease = db.query(models.Lease).options(
+    result = await db.scalars(select(models.Lease).options(
         joinedload(models.Lease.room),
         joinedload(models.Lease.bills)
     ).filter(
         models.Lease.tenant_id == tenant_id,
         models.Lease.status == "Active"
-    ).first()
+    ))
+    lease = result.unique().first()
     if not lease:
         raise HTTPException(status_code=404, detail="No active lease found")
     return lease
 
 @router.get("/my/bills", response_model=list[schemas.BillResponse])
-def get_my_bills(tenant_id: int = Depends(get_tenant_id), db: Session = Depends(get_db)):
-    """获取当前租客的账单"""
-    bills = db.query(models.Bill).join(models.Lease).filter(
+async def get_my_bills(
+    period_from: str = Query(None, pattern=PERIOD_PATTERN),
+    period_to: str = Query(None, pattern=PERIOD_PATTERN),
+    tenant_id: int = Depends(get_tenant_id),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取当前租客的账单，账期范围涉及归档分界之前的账期时同时返回归档账单"""
+    query = select(*bill_response_columns()).join(models.Lease).filter(
+        models.Lease.tenant_id == tenant_id,
+        *bill_period_clauses(period_from, period_to)
+    )
+    if wants_archive(period_from, period_to):
+        archived = select(*ARCHIVED_BILL_RESPONSE_COLUMNS).join(models.Lease).filter(
+            models.Lease.tenant_id == tenant_id,
+            *bill_period_clauses(period_from, period_to, models.BillArchive)
+        )
+        query = union_all(query, archived)
+    result = await db.execute(query)
+    return json_response(encode_rows(result.mappings().all()))
+
+@router.get("/my/summary", response_model=schemas.MyBillSummary)
+async def get_my_summary(tenant_id: int = Depends(get_tenant_id), db: AsyncSession = Depends(get_async_db)):
+    """获取当前租客的账单统计和下一期待缴账单（单次查询），已支付数量包含归档账单"""
+    Bill = models.Bill
+    today = date.today()
+    unpaid = Bill.status != "Paid"
+    overdue = and_(unpaid, Bill.due_date < today)
+    pending = and_(unpaid, Bill.due_date >= today)
+
+    totals = select(
+        func.count(case((pending, 1))).label("pending_count"),
+        func.count(case((overdue, 1))).label("overdue_count"),
+        func.count(case((Bill.status == "Paid", 1))).label("paid_count"),
+        func.coalesce(func.sum(case((pending, Bill.total_amount))), 0.0).label("pending_amount"),
+        func.coalesce(func.sum(case((overdue, Bill.total_amount))), 0.0).label("overdue_amount"),
+    ).join(models.Lease).filter(models.Lease.tenant_id == tenant_id).subquery()
+    archived_paid = select(func.count(models.BillArchive.id)).join(models.Lease).filter(
         models.Lease.tenant_id == tenant_id
-    ).all()
+    ).scalar_subquery().label("archived_paid_count")
+
+    next_bill = select(Bill).join(models.Lease).filter(
+        models.Lease.tenant_id == tenant_id,
+        pending
+    ).order_by(Bill.due_date, Bill.id).limit(1).subquery()
+
+    row = (await db.execute(
+        select(totals, archived_paid, next_bill).select_from(totals).outerjoin(next_bill, true())
+    )).one()
 
-    # 添加状态信息
-    for bill in bills:
-        bill.status = get_bill_status(bill)
+    next_due_bill = None
+    if row.id is not None:
+        next_due_bill = schemas.BillResponse(
+            id=row.id,
+            lease_id=row.lease_id,
+            period=row.period,
+            rent_fee=row.rent_fee,
+            water_fee=row.water_fee,
+            elec_fee=row.elec_fee,
+            total_amount=row.total_amount,
+            status="Pending",
+            due_date=row.due_date,
+        )
 
-    return bills
+    return schemas.MyBillSummary(
+        pending_count=row.pending_count,
+        overdue_count=row.overdue_count,
+        paid_count=row.paid_count + row.archived_paid_count,
+        pending_amount=row.pending_amount,
+        overdue_amount=row.overdue_amount,
+        outstanding_amount=row.pending_amount + row.overdue_amount,
+        next_due_bill=next_due_bill,
+    )
 
 @router.post("/my/bills/{bill_id}/pay", response_model=schemas.BillResponse)
-def pay_my_bill(bill_id: int, tenant_id: int = Depends(get_tenant_id), db: Session = Depends(get_db)):
-    """支付账单（租客权限）"""
-    # 验证账单是否属于该租客
-    bill = db.query(models.Bill).join(models.Lease).filter(
-        models.Bill.id == bill_id,
-        models.Lease.tenant_id == tenant_id
-    ).first()
+def pay_my_bill(
+    bill_id: int,
+    tenant_id: int = Depends(get_tenant_id),
+    idempotency_key: str = Header(None),
+    db: Session = Depends(get_db)
+):
+    """支付账单（租客权限）
 
+    携带 Idempotency-Key 时保存成功的响应，使用同一个键重试直接返回保存的结果。
+    """
+    request = f"pay:{bill_id}"
+    if idempotency_key:
+        try:
+            stored = get_stored_response(db, tenant_id, idempotency_key, request)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        if stored:
+            return Response(
+                content=stored.response_body,
+                status_code=stored.status_code,
+                media_type="application/json",
+                headers={"Idempotent-Replayed": "true"}
+            )
+
+    bill, newly_paid = pay_bill(db, bill_id, tenant_id)
     if not bill:
         raise HTTPException(status_code=404, detail="Bill not found or access denied")
 
-    updated_bill = pay_bill(db, bill_id)
-    if not updated_bill:
-        raise HTTPException(status_code=404, detail="Bill not found")
-
-    updated_bill.status = get_bill_status(updated_bill)
-    return updated_bill
\ No newline at end of file
+    body = encode_row(bill)
+    if idempotency_key:
+        store_response(db, tenant_id, idempotency_key, request, 200, body)
+    db.commit()
+    if newly_paid:
+        response_cache.invalidate("leases")
+    return json_response(body)
\ No newline at end of file
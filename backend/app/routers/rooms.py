@@ -0,0 +1,91 @@
+from datetime import date
+from dateutil.relativedelta import relativedelta
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app import models, schemas
+from app.database import get_db
+from app.serializers import response_columns, encode_rows, json_response
+from app.services.search_service import SEARCH_MODE_PATTERN, room_search_query
+from app.services.availability_service import vacant_room_conditions, room_calendar
+
+router = APIRouter()
+
+ROOM_RESULT_COLUMNS = response_columns(
+    schemas.RoomSearchResult, models.Room, {"building_name": models.Building.name}
+)
+
+@router.get("/rooms/search", response_model=list[schemas.RoomSearchResult])
+def search_rooms(
+    q: str = Query(..., min_length=1, max_length=100),
+    mode: str = Query("contains", pattern=SEARCH_MODE_PATTERN),
+    building_id: int = None,
+    status: str = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: int = None,
+    db: Session = Depends(get_db)
+):
+    """按房间号或楼宇名称搜索房间，可按楼宇和状态过滤
+
+    按 id 游标分页，下一页游标通过 X-Next-Cursor 响应头返回。
+    """
+    Room = models.Room
+    query, key = room_search_query(db, ROOM_RESULT_COLUMNS, q, mode)
+    query = query.order_by(key)
+    if building_id:
+        query = query.filter(Room.building_id == building_id)
+    if status:
+        query = query.filter(Room.status == status)
+    if cursor is not None:
+        query = query.filter(key > cursor)
+    return _room_page(db, query, limit)
+
+def _room_page(db: Session, query, limit: int):
+    # 多取一行用于判断是否还有下一页
+    rooms = db.execute(query.limit(limit + 1)).mappings().all()
+    headers = {}
+    if len(rooms) > limit:
+        rooms = rooms[:limit]
+        headers["X-Next-Cursor"] = str(rooms[-1]["id"])
+    return json_response(encode_rows(rooms), headers)
+
+@router.get("/rooms/vacant", response_model=list[schemas.RoomSearchResult])
+def get_vacant_rooms(
+    start_date: date,
+    end_date: date,
+    building_id: int = None,
+    min_area: float = Query(None, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: int = None,
+    db: Session = Depends(get_db)
+):
+    """查询 [start_date, end_date) 内没有有效合同的房间，可按楼宇和最小面积过滤
+
+    按 id 游标分页，下一页游标通过 X-Next-Cursor 响应头返回。
+    """
+    if end_date <= start_date:
+        raise HTTPException(status_code=400, detail="End date must be after start date")
+    Room = models.Room
+    query = select(*ROOM_RESULT_COLUMNS) \
+        .join(models.Building, Room.building_id == models.Building.id) \
+        .filter(*vacant_room_conditions(start_date, end_date, building_id, min_area)) \
+        .order_by(Room.id)
+    if cursor is not None:
+        query = query.filter(Room.id > cursor)
+    return _room_page(db, query, limit)
+
+@router.get("/rooms/{room_id}/availability", response_model=schemas.RoomAvailability)
+def get_room_availability(
+    room_id: int,
+    date_from: date = None,
+    date_to: date = None,
+    db: Session = Depends(get_db)
+):
+    """房间在 [date_from, date_to) 内的占用和空闲区间，默认从今天起一年"""
+    date_from = date_from or date.today()
+    date_to = date_to or date_from + relativedelta(years=1)
+    if date_to <= date_from:
+        raise HTTPException(status_code=400, detail="date_to must be after date_from")
+    if db.get(models.Room, room_id) is None:
+        raise HTTPException(status_code=404, detail="Room not found")
+    return room_calendar(db, room_id, date_from, date_to)
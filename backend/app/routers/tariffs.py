@@ -0,0 +1,67 @@
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Header
+from sqlalchemy.orm import Session
+from app import models, schemas
+from app.database import get_db
+from app.cache import response_cache
+from app.services.tariff_service import tariff_cache, rerate_unpaid_bills
+
+router = APIRouter()
+
+def get_landlord_role(x_role: str = Header(None)):
+    """验证房东身份"""
+    if x_role != "landlord":
+        raise HTTPException(status_code=403, detail="Forbidden: Landlord access required")
+    return x_role
+
+def apply_tariff_change(db: Session, building_id: int, since: date) -> int:
+    """价格表变更后使缓存失效，并重新计算受影响的未支付账单"""
+    tariff_cache.invalidate()
+    rerated = rerate_unpaid_bills(db, building_id, since)
+    if rerated:
+        response_cache.invalidate("leases")
+    return rerated
+
+@router.get("/tariffs", response_model=list[schemas.TariffResponse])
+def get_tariffs(building_id: int = None, db: Session = Depends(get_db), x_role: str = Depends(get_landlord_role)):
+    """获取价格表（房东权限），指定 building_id 时只返回该楼宇的价格表"""
+    query = db.query(models.Tariff)
+    if building_id:
+        query = query.filter(models.Tariff.building_id == building_id)
+    return query.order_by(models.Tariff.building_id, models.Tariff.utility, models.Tariff.effective_from).all()
+
+@router.post("/tariffs", response_model=schemas.TariffChangeResult)
+def create_tariff(tariff: schemas.TariffCreate, db: Session = Depends(get_db), x_role: str = Depends(get_landlord_role)):
+    """新增价格表（房东权限），并按新价格重新计算生效日期之后的未支付账单"""
+    if tariff.building_id and not db.get(models.Building, tariff.building_id):
+        raise HTTPException(status_code=404, detail="Building not found")
+    db_tariff = models.Tariff(**tariff.model_dump())
+    db.add(db_tariff)
+    db.commit()
+    db.refresh(db_tariff)
+    rerated = apply_tariff_change(db, tariff.building_id, tariff.effective_from)
+    return {"tariff": db_tariff, "rerated_bills": rerated}
+
+@router.delete("/tariffs/{tariff_id}", response_model=schemas.TariffChangeResult)
+def delete_tariff(tariff_id: int, db: Session = Depends(get_db), x_role: str = Depends(get_landlord_role)):
+    """删除价格表（房东权限），并重新计算受影响的未支付账单"""
+    tariff = db.get(models.Tariff, tariff_id)
+    if not tariff:
+        raise HTTPException(status_code=404, detail="Tariff not found")
+    building_id, since = tariff.building_id, tariff.effective_from
+    db.delete(tariff)
+    db.commit()
+    return {"rerated_bills": apply_tariff_change(db, building_id, since)}
+
+@router.post("/tariffs/rerate", response_model=schemas.TariffChangeResult)
+def rerate_bills(
+    building_id: int = None,
+    since: date = None,
+    db: Session = Depends(get_db),
+    x_role: str = Depends(get_landlord_role)
+):
+    """按当前价格表重新计算未支付账单（房东权限）"""
+    rerated = rerate_unpaid_bills(db, building_id, since)
+    if rerated:
+        response_cache.invalidate("leases")
+    return {"rerated_bills": rerated}
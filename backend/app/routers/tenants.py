@@ -1,15 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from app import models, schemas
 from app.database import get_db
+from app.cache import response_cache
+from app.serializers import response_columns, encode_rows, json_response
+from app.services.search_service import SEARCH_MODE_PATTERN, tenant_search_query
 
 router = APIRouter()
 
+TENANT_RESPONSE_COLUMNS = response_columns(schemas.TenantResponse, models.Tenant)
+
 @router.get("/tenants", response_model=list[schemas.TenantResponse])
-def get_tenants(db: Session = Depends(get_db)):
+def get_tenants(request: Request, db: Session = Depends(get_db)):
     """获取所有租客"""
+    cache_key = response_cache.key_for(request, ["tenants"])
+    cached = response_cache.lookup(request, cache_key)
+    if cached:
+        return cached
+
     tenants = db.query(models.Tenant).all()
-    return tenants
+    return response_cache.store(request, cache_key, list[schemas.TenantResponse], tenants)
+
+@router.get("/tenants/search", response_model=list[schemas.TenantResponse])
+def search_tenants(
+    q: str = Query(..., min_length=1, max_length=100),
+    mode: str = Query("contains", pattern=SEARCH_MODE_PATTERN),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: int = None,
+    db: Session = Depends(get_db)
+):
+    """按姓名或电话搜索租客（mode 为 contains 子串匹配或 prefix 前缀匹配，不区分大小写）
+
+    按 id 游标分页，下一页游标通过 X-Next-Cursor 响应头返回。
+    """
+    query, key = tenant_search_query(db, TENANT_RESPONSE_COLUMNS, q, mode)
+    query = query.order_by(key)
+    if cursor is not None:
+        query = query.filter(key > cursor)
+    # 多取一行用于判断是否还有下一页
+    tenants = db.execute(query.limit(limit + 1)).mappings().all()
+    headers = {}
+    if len(tenants) > limit:
+        tenants = tenants[:limit]
+        headers["X-Next-Cursor"] = str(tenants[-1]["id"])
+    return json_response(encode_rows(tenants), headers)
 
 @router.get("/tenants/{tenant_id}", response_model=schemas.TenantResponse)
 def get_tenant(tenant_id: int, db: Session = Depends(get_db)):
@@ -26,4 +60,5 @@ def create_tenant(tenant: schemas.TenantBase, db: Session = Depends(get_db)):
     db.add(db_tenant)
     db.commit()
     db.refresh(db_tenant)
+    response_cache.invalidate("tenants")
     return db_tenant
\ No newline at end of file
@@ -1,5 +1,9 @@
-from .building import BuildingCreate, BuildingResponse
-from .room import RoomCreate, RoomResponse, RoomStatusUpdate
+from .building import BuildingCreate, BuildingResponse, BuildingSummary
+from .room import (
+    RoomCreate, RoomResponse, RoomSearchResult, RoomStatusUpdate, DateInterval, LeaseInterval, RoomAvailability
+)
 from .tenant import TenantBase, TenantResponse
-from .lease import LeaseCreate, LeaseResponse
-from .bill import BillResponse, MeterReadingInput, BillPayInput
\ No newline at end of file
+from .lease import LeaseCreate, LeaseResponse, LeaseDetail, LeaseBulkError, LeaseBulkResult
+from .bill import BillResponse, MeterReadingInput, MeterReadingRow, MeterReadingBulkError, MeterReadingBulkResult, BillPayInput, BillingSummaryResponse, MyBillSummary
+from .meter_reading import MeterReadingResponse, ConsumptionRow, ConsumptionAnomaly
+from .tariff import TariffTier, TariffCreate, TariffResponse, TariffChangeResult
\ No newline at end of file
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, AliasChoices
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 
 class BillBase(BaseModel):
     period: str
@@ -14,6 +14,8 @@ class BillBase(BaseModel):
 class BillResponse(BillBase):
     id: int
     lease_id: int
+    # 从 ORM 对象读取时使用包含逾期判断的 current_status
+    status: str = Field(validation_alias=AliasChoices("current_status", "status"))
 
     class Config:
         orm_mode = True
@@ -22,5 +24,38 @@ class MeterReadingInput(BaseModel):
     current_water_reading: float
     current_elec_reading: float
 
+class MeterReadingRow(BaseModel):
+    bill_id: Optional[int] = None
+    room_number: Optional[str] = None
+    current_water_reading: float = Field(validation_alias=AliasChoices("current_water_reading", "water"))
+    current_elec_reading: float = Field(validation_alias=AliasChoices("current_elec_reading", "elec"))
+
+class MeterReadingBulkError(BaseModel):
+    row: int
+    detail: str
+
+class MeterReadingBulkResult(BaseModel):
+    updated: int
+    bill_ids: List[int] = []
+    errors: List[MeterReadingBulkError] = []
+
 class BillPayInput(BaseModel):
-    bill_id: int
\ No newline at end of file
+    bill_id: int
+
+class BillingSummaryResponse(BaseModel):
+    building_id: int
+    period: str
+    bill_count: int
+    billed_amount: float
+    collected_amount: float
+    outstanding_amount: float
+    overdue_amount: float
+
+class MyBillSummary(BaseModel):
+    pending_count: int
+    overdue_count: int
+    paid_count: int
+    pending_amount: float
+    overdue_amount: float
+    outstanding_amount: float
+    next_due_bill: Optional[BillResponse] = None
\ No newline at end of file
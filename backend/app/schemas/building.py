@@ -14,4 +14,14 @@ class BuildingResponse(BuildingBase):
     rooms: List[RoomResponse] = []
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+class BuildingSummary(BaseModel):
+    building_id: int
+    name: str
+    total_rooms: int
+    vacant_rooms: int
+    occupied_rooms: int
+    maintenance_rooms: int
+    occupancy_rate: float
+    leased_area: float
\ No newline at end of file
@@ -1,7 +1,9 @@
 from pydantic import BaseModel
 from datetime import date
-from typing import List
+from typing import List, Optional
 from .bill import BillResponse
+from .room import RoomResponse
+from .tenant import TenantResponse
 
 class LeaseBase(BaseModel):
     room_id: int
@@ -20,4 +22,31 @@ class LeaseResponse(LeaseBase):
     bills: List[BillResponse] = []
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+class LeaseDetail(BaseModel):
+    """合同列表/详情接口的响应
+
+    只返回 fields 选择的合同字段（未指定时返回全部）和 include 指定的关联数据（默认 room、tenant），
+    未选择的字段不会出现在响应中，因此除 id 外均为可选；room、tenant 在关联不存在时为 null。
+    """
+    id: int
+    room_id: Optional[int] = None
+    tenant_id: Optional[int] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    rent_amount: Optional[float] = None
+    deposit: Optional[float] = None
+    status: Optional[str] = None
+    room: Optional[RoomResponse] = None
+    tenant: Optional[TenantResponse] = None
+    bills: Optional[List[BillResponse]] = None
+
+class LeaseBulkError(BaseModel):
+    row: int
+    detail: str
+
+class LeaseBulkResult(BaseModel):
+    created: int
+    lease_ids: List[int] = []
+    errors: List[LeaseBulkError] = []
\ No newline at end of file
@@ -0,0 +1,38 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+class MeterReadingResponse(BaseModel):
+    room_id: int
+    read_at: datetime
+    building_id: int
+    bill_id: Optional[int] = None
+    period: str
+    water_reading: float
+    elec_reading: float
+    water_usage: float
+    elec_usage: float
+
+    class Config:
+        orm_mode = True
+
+class ConsumptionRow(BaseModel):
+    building_id: Optional[int] = None
+    room_id: Optional[int] = None
+    period: Optional[str] = None
+    reading_count: int
+    water_usage: float
+    elec_usage: float
+
+class ConsumptionAnomaly(BaseModel):
+    room_id: int
+    building_id: int
+    read_at: datetime
+    period: str
+    water_usage: float
+    elec_usage: float
+    # 此前若干次读数的平均用量，没有历史读数时为 None
+    water_trailing_avg: Optional[float] = None
+    elec_trailing_avg: Optional[float] = None
+    water_spike: bool
+    elec_spike: bool
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional
+from datetime import date
+from typing import List, Optional
 
 class RoomBase(BaseModel):
     room_number: str
@@ -18,5 +19,23 @@ class RoomResponse(RoomBase):
     class Config:
         orm_mode = True
 
+class RoomSearchResult(RoomResponse):
+    building_name: Optional[str] = None
+
+class DateInterval(BaseModel):
+    start_date: date
+    end_date: date
+
+class LeaseInterval(DateInterval):
+    lease_id: int
+
+class RoomAvailability(BaseModel):
+    """房间在 [date_from, date_to) 内的占用和空闲区间（结束日期不含）"""
+    room_id: int
+    date_from: date
+    date_to: date
+    leases: List[LeaseInterval] = []
+    free: List[DateInterval] = []
+
 class RoomStatusUpdate(BaseModel):
     status: str
\ No newline at end of file
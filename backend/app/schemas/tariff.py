@@ -0,0 +1,36 @@
+from pydantic import BaseModel, field_validator
+from datetime import date
+from typing import List, Literal, Optional
+
+class TariffTier(BaseModel):
+    up_to: Optional[float] = None  # 本档用量上限，None 表示不设上限
+    unit_price: float
+
+class TariffCreate(BaseModel):
+    building_id: Optional[int] = None  # 为空表示默认价格
+    utility: Literal["water", "elec"]
+    effective_from: date
+    tiers: List[TariffTier]
+
+    @field_validator("tiers")
+    @classmethod
+    def check_tiers(cls, tiers):
+        if not tiers:
+            raise ValueError("at least one tier is required")
+        limits = [tier.up_to for tier in tiers]
+        if limits[-1] is not None or None in limits[:-1]:
+            raise ValueError("only the last tier must have up_to = null")
+        bounded = limits[:-1]
+        if any(b <= a for a, b in zip(bounded, bounded[1:])) or (bounded and bounded[0] <= 0):
+            raise ValueError("up_to must be positive and strictly increasing")
+        return tiers
+
+class TariffResponse(TariffCreate):
+    id: int
+
+    class Config:
+        orm_mode = True
+
+class TariffChangeResult(BaseModel):
+    tariff: Optional[TariffResponse] = None
+    rerated_bills: int
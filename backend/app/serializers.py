@@ -0,0 +1,57 @@
+from collections import defaultdict
+import orjson
+from fastapi import Response
+from sqlalchemy import inspect
+
+def response_columns(schema, model, overrides: dict = None, fields=None, prefix: str = ""):
+    """按响应 schema 的字段顺序选出所需列，避免加载完整 ORM 对象
+
+    overrides 用于指定与模型属性不同的列表达式（如 status 使用 current_status）。
+    嵌套的列表字段（如 LeaseResponse.bills）需单独查询，这里跳过。
+    fields 不为空时只选出其中的字段；prefix 用于给嵌套对象的列加前缀（见 nest_prefixed）。
+    """
+    overrides = overrides or {}
+    column_attrs = inspect(model).column_attrs
+    columns = []
+    for name in schema.model_fields:
+        if fields is not None and name not in fields:
+            continue
+        if name in overrides:
+            columns.append(overrides[name].label(prefix + name))
+        elif name in column_attrs:
+            columns.append(getattr(model, name).label(prefix + name))
+    return columns
+
+def nest_prefixed(row, fields) -> dict:
+    """将 "room__id" 形式的列归并为嵌套对象 {"room": {"id": ...}}
+
+    外连接没有匹配行（主键为 None）时嵌套对象为 None。
+    """
+    result = {}
+    nested = {field: {} for field in fields}
+    for key, value in row.items():
+        field, sep, name = key.partition("__")
+        if sep and field in nested:
+            nested[field][name] = value
+        else:
+            result[key] = value
+    for field, values in nested.items():
+        result[field] = values if values.get("id") is not None else None
+    return result
+
+def encode_rows(rows) -> bytes:
+    """将查询得到的行映射编码为 JSON 数组，与 FastAPI 默认输出逐字节一致"""
+    return orjson.dumps([dict(row) for row in rows])
+
+def encode_row(row) -> bytes:
+    return orjson.dumps(dict(row))
+
+def embed_children(parents, children, foreign_key: str, field: str):
+    """将子行按外键分组后嵌入父行的 field 字段"""
+    grouped = defaultdict(list)
+    for child in children:
+        grouped[child[foreign_key]].append(dict(child))
+    return [dict(parent, **{field: grouped.get(parent["id"], [])}) for parent in parents]
+
+def json_response(body: bytes, headers: dict = None) -> Response:
+    return Response(content=body, media_type="application/json", headers=headers)
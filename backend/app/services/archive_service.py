@@ -0,0 +1,56 @@
+import os
+from datetime import date
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+from app.cache import response_cache
+from app.models import Bill, BillArchive
+
+# 账期早于当月之前 BILL_ARCHIVE_MONTHS 个月的已支付账单会被归档
+BILL_ARCHIVE_MONTHS = int(os.getenv("BILL_ARCHIVE_MONTHS", 24))
+ARCHIVE_COLUMNS = [column.name for column in BillArchive.__table__.columns]
+
+def archive_cutoff(today: date = None, months: int = None) -> str:
+    """归档分界账期，早于该账期的已支付账单可以归档"""
+    today = today or date.today()
+    months = BILL_ARCHIVE_MONTHS if months is None else months
+    day = today.replace(day=1) - relativedelta(months=months)
+    return f"{day.year}-{day.month:02d}"
+
+def wants_archive(period_from: str = None, period_to: str = None, today: date = None) -> bool:
+    """请求的账期范围是否涉及归档分界之前的账期，未指定范围时只查询在线账单"""
+    cutoff = archive_cutoff(today)
+    return any(period is not None and period < cutoff for period in (period_from, period_to))
+
+def archive_settled_bills(db: Session, cutoff: str, batch_size: int = 2000, progress=None) -> int:
+    """将账期早于 cutoff 的已支付账单分批移入 bills_archive，返回归档的账单数
+
+    每批在同一事务内复制后删除，中途中断后重新执行即可继续。
+    账单汇总（billing_summary）仍计入归档账单，归档不改变汇总。
+    归档账单保留原 id，bills 的 id 不会复用（SQLite 上为 AUTOINCREMENT，见迁移 0009）。
+    归档的账单不再出现在 /leases?include=bills 中，有账单被归档时（包括中途中断）使合同缓存失效。
+    """
+    bill_columns = [Bill.__table__.c[name] for name in ARCHIVE_COLUMNS]
+    archived = 0
+    last_id = 0
+    try:
+        while True:
+            ids = db.scalars(
+                select(Bill.id)
+                .filter(Bill.status == "Paid", Bill.period < cutoff, Bill.id > last_id)
+                .order_by(Bill.id)
+                .limit(batch_size)
+            ).all()
+            if not ids:
+                break
+            db.execute(insert(BillArchive).from_select(ARCHIVE_COLUMNS, select(*bill_columns).filter(Bill.id.in_(ids))))
+            db.execute(delete(Bill).where(Bill.id.in_(ids)), execution_options={"synchronize_session": False})
+            db.commit()
+            archived += len(ids)
+            last_id = ids[-1]
+            if progress:
+                progress(archived)
+    finally:
+        if archived:
+            response_cache.invalidate("leases")
+    return archived
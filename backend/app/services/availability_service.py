@@ -0,0 +1,102 @@
+from datetime import date, timedelta
+from sqlalchemy import and_, exists, select, update
+from sqlalchemy.orm import Session
+from app.models import Lease, Room
+
+# 占用房间的合同状态；已终止合同（含提前退租）不再占用
+BLOCKING_STATUS = "Active"
+
+def overlaps(start_date: date, end_date: date, room_id=None):
+    """与 [start_date, end_date) 重叠的有效合同条件，可命中 (room_id, end_date) 索引
+
+    room_id 可以是房间 id 或列表达式（用于关联子查询）。
+    """
+    conditions = [Lease.status == BLOCKING_STATUS, Lease.end_date > start_date, Lease.start_date < end_date]
+    if room_id is not None:
+        conditions.insert(0, Lease.room_id == room_id)
+    return and_(*conditions)
+
+def find_conflicts(db: Session, room_id: int, start_date: date, end_date: date) -> list:
+    """房间在 [start_date, end_date) 内已有的有效合同 id"""
+    return db.scalars(
+        select(Lease.id).filter(overlaps(start_date, end_date, room_id)).order_by(Lease.start_date)
+    ).all()
+
+def find_batch_conflicts(db: Session, leases: list) -> set:
+    """批量校验：返回与已有有效合同重叠的 leases 下标，每个房间一次索引查找"""
+    room_ids = {lease.room_id for lease in leases}
+    if not room_ids:
+        return set()
+    first = min(lease.start_date for lease in leases)
+    last = max(lease.end_date for lease in leases)
+    existing = {}
+    for room_id, start, end in db.execute(
+        select(Lease.room_id, Lease.start_date, Lease.end_date)
+        .filter(Lease.room_id.in_(room_ids), overlaps(first, last))
+    ):
+        existing.setdefault(room_id, []).append((start, end))
+    return {
+        index for index, lease in enumerate(leases)
+        if any(start < lease.end_date and end > lease.start_date for start, end in existing.get(lease.room_id, []))
+    }
+
+def vacant_room_conditions(start_date: date, end_date: date, building_id: int = None, min_area: float = None) -> list:
+    """[start_date, end_date) 内没有有效合同的房间条件，维修中的房间除外
+
+    每个候选房间通过 (room_id, end_date) 索引判断是否有重叠合同，耗时与合同总数无关。
+    """
+    conditions = [Room.status != "Maintenance", ~exists().where(overlaps(start_date, end_date, Room.id))]
+    if building_id:
+        conditions.append(Room.building_id == building_id)
+    if min_area is not None:
+        conditions.append(Room.area >= min_area)
+    return conditions
+
+def room_calendar(db: Session, room_id: int, date_from: date, date_to: date) -> dict:
+    """房间在 [date_from, date_to) 内的占用区间和空闲区间"""
+    leases = db.execute(
+        select(Lease.id, Lease.start_date, Lease.end_date)
+        .filter(overlaps(date_from, date_to, room_id))
+        .order_by(Lease.start_date)
+    ).all()
+
+    free = []
+    cursor = date_from
+    for lease in leases:
+        if lease.start_date > cursor:
+            free.append({"start_date": cursor, "end_date": lease.start_date})
+        cursor = max(cursor, lease.end_date)
+    if cursor < date_to:
+        free.append({"start_date": cursor, "end_date": date_to})
+
+    return {
+        "room_id": room_id,
+        "date_from": date_from,
+        "date_to": date_to,
+        "leases": [
+            {"lease_id": lease.id, "start_date": lease.start_date, "end_date": lease.end_date}
+            for lease in leases
+        ],
+        "free": free,
+    }
+
+def occupied_on(start_date: date, end_date: date, day: date = None) -> bool:
+    """合同在 day（默认今天）是否生效，用于更新房间的当前状态"""
+    day = day or date.today()
+    return start_date <= day < end_date
+
+def sync_room_statuses(db: Session, today: date = None) -> int:
+    """按当天生效的有效合同同步房间状态，返回更新的房间数（维修中的房间不变）
+
+    提前签订的合同开始后房间变为已租，合同结束且没有后续合同时变为空置。提交事务。
+    """
+    today = today or date.today()
+    current = exists().where(overlaps(today, today + timedelta(days=1), Room.id))
+    updated = 0
+    for status, condition in (("Occupied", current), ("Vacant", ~current)):
+        updated += db.execute(
+            update(Room).where(Room.status.notin_(("Maintenance", status)), condition).values(status=status),
+            execution_options={"synchronize_session": False}
+        ).rowcount
+    db.commit()
+    return updated
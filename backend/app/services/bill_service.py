@@ -1,19 +1,31 @@
-from datetime import date, timedelta
+import csv
+import io
+import json
+import os
+from datetime import date, datetime, timedelta
+from pydantic import ValidationError
+from sqlalchemy import and_, or_, insert, select, update
 from sqlalchemy.orm import Session
-from app.models import Lease, Bill, Room
-from app.schemas import LeaseCreate
+from app.events import change_feed
+from app.models import Lease, Bill, Room, MeterReading
+from app.schemas import LeaseCreate, MeterReadingRow, BillResponse
+from app.serializers import response_columns
+from app.services.summary_service import (
+    new_deltas, apply_summary_deltas, add_new_bills, add_amount_change, apply_lease_payment
+)
+from app.services.tariff_service import tariff_cache, WATER_UNIT_PRICE, ELEC_UNIT_PRICE
 from dateutil.relativedelta import relativedelta
 
-# 水电费单价
-WATER_UNIT_PRICE = 5.0  # 5元/吨
-ELEC_UNIT_PRICE = 1.0   # 1元/度
+# 账单生成模式：upfront 在签约时生成整个租期的账单；
+# rolling 只生成截至当月往后 BILLING_HORIZON 期的账单，其余由 roll_bills.py 定期补齐
+BILLING_MODE = os.getenv("BILLING_MODE", "upfront")
+BILLING_HORIZON = int(os.getenv("BILLING_HORIZON", 3))
 
-def generate_bills_for_lease(db: Session, lease: Lease):
-    """为合同生成所有分期账单"""
-    start_date = lease.start_date
-    end_date = lease.end_date
-    rent_amount = lease.rent_amount
+def build_bill_rows(lease_id: int, start_date: date, end_date: date, rent_amount: float, today: date = None):
+    """计算合同租期内所有分期账单的字段，返回字典列表（可直接用于批量插入）
 
+    today 默认为当天，用于判断截止日是否已过；生成历史数据时可指定。
+    """
     # 计算租期总月数
     delta = relativedelta(end_date, start_date)
     total_months = delta.years * 12 + delta.months
@@ -21,8 +33,9 @@ def generate_bills_for_lease(db: Session, lease: Lease):
     if total_months <= 0:
         return []
 
-    bills = []
+    rows = []
     current_date = start_date
+    today = today or date.today()
 
     for month in range(total_months):
         # 生成账单周期（YYYY-MM）
@@ -32,23 +45,24 @@ def generate_bills_for_lease(db: Session, lease: Lease):
         due_date = current_date.replace(day=15)
 
         # 如果截止日已过，设置为下个月15号
-        if due_date < date.today():
+        if due_date < today:
             if current_date.month == 12:
                 due_date = due_date.replace(year=current_date.year + 1, month=1)
             else:
                 due_date = due_date.replace(month=current_date.month + 1)
 
-        bill = Bill(
-            lease_id=lease.id,
-            period=period,
-            rent_fee=rent_amount,
-            water_fee=0.0,
-            elec_fee=0.0,
-            total_amount=rent_amount,
-            status="Pending",
-            due_date=due_date
-        )
-        bills.append(bill)
+        rows.append({
+            "lease_id": lease_id,
+            "period": period,
+            "rent_fee": rent_amount,
+            "water_fee": 0.0,
+            "elec_fee": 0.0,
+            "water_usage": 0.0,
+            "elec_usage": 0.0,
+            "total_amount": rent_amount,
+            "status": "Pending",
+            "due_date": due_date,
+        })
 
         # 计算下个月的日期
         if current_date.month == 12:
@@ -56,7 +70,31 @@ def generate_bills_for_lease(db: Session, lease: Lease):
         else:
             current_date = current_date.replace(month=current_date.month + 1)
 
+    return rows
+
+def billing_horizon(today: date = None, periods: int = None) -> str:
+    """滚动生成的最后一个账期（YYYY-MM），当月算作第一期"""
+    last = (today or date.today()).replace(day=1) + relativedelta(months=(periods or BILLING_HORIZON) - 1)
+    return f"{last.year}-{last.month:02d}"
+
+def limit_to_horizon(rows: list, today: date = None) -> list:
+    """滚动模式下只保留不晚于 billing_horizon 的账单，upfront 模式原样返回"""
+    if BILLING_MODE != "rolling":
+        return rows
+    horizon = billing_horizon(today)
+    return [row for row in rows if row["period"] <= horizon]
+
+def generate_bills_for_lease(db: Session, lease: Lease):
+    """为合同生成分期账单（滚动模式下只生成近期账单）"""
+    rows = limit_to_horizon(build_bill_rows(lease.id, lease.start_date, lease.end_date, lease.rent_amount))
+    bills = [Bill(**row) for row in rows]
     db.add_all(bills)
+
+    # 同步更新账单汇总
+    building_id = db.query(Room.building_id).filter(Room.id == lease.room_id).scalar()
+    deltas = new_deltas()
+    add_new_bills(deltas, building_id, rows)
+    apply_summary_deltas(db, deltas)
     return bills
 
 def update_bill_with_meter_reading(db: Session, bill_id: int, current_water: float, current_elec: float):
@@ -79,38 +117,284 @@ def update_bill_with_meter_reading(db: Session, bill_id: int, current_water: flo
     water_usage = current_water - room.last_water_reading
     elec_usage = current_elec - room.last_elec_reading
 
-    water_fee = water_usage * WATER_UNIT_PRICE
-    elec_fee = elec_usage * ELEC_UNIT_PRICE
+    # 按楼宇在该账期生效的阶梯价格计费
+    tariffs = tariff_cache.tables(db)
+    water_fee = tariff_cache.charge(tariffs, room.building_id, "water", bill.period, water_usage)
+    elec_fee = tariff_cache.charge(tariffs, room.building_id, "elec", bill.period, elec_usage)
 
     # 更新账单
+    old_total = bill.total_amount or 0.0
+    bill.water_usage = water_usage
+    bill.elec_usage = elec_usage
     bill.water_fee = water_fee
     bill.elec_fee = elec_fee
     bill.total_amount = bill.rent_fee + water_fee + elec_fee
 
-    # 更新房间的最后读数
+    # 同步更新账单汇总
+    deltas = new_deltas()
+    add_amount_change(deltas, room.building_id, bill.period, bill.due_date, bill.status, bill.total_amount - old_total)
+    apply_summary_deltas(db, deltas)
+
+    # 更新房间的最后读数，并追加读数历史
     room.last_water_reading = current_water
     room.last_elec_reading = current_elec
+    db.add(MeterReading(
+        room_id=room.id,
+        read_at=datetime.now(),
+        building_id=room.building_id,
+        bill_id=bill.id,
+        period=bill.period,
+        water_reading=current_water,
+        elec_reading=current_elec,
+        water_usage=water_usage,
+        elec_usage=elec_usage,
+    ))
+    change_feed.publish(db, [metered_event(bill.id, bill.lease_id, bill.lease.tenant_id, room.building_id, bill.period, {
+        "water_usage": water_usage,
+        "elec_usage": elec_usage,
+        "water_fee": water_fee,
+        "elec_fee": elec_fee,
+        "total_amount": bill.total_amount,
+    })])
 
     db.commit()
     db.refresh(bill)
     return bill
 
-def pay_bill(db: Session, bill_id: int):
-    """支付账单"""
-    bill = db.query(Bill).filter(Bill.id == bill_id).first()
-    if not bill:
-        return None
+def metered_event(bill_id: int, lease_id: int, tenant_id: int, building_id: int, period: str, charges: dict) -> dict:
+    """账单录入水电读数的变更事件，charges 包含用量、水电费和新的总额"""
+    return {
+        "type": "bill.metered",
+        "bill_id": bill_id,
+        "lease_id": lease_id,
+        "tenant_id": tenant_id,
+        "building_id": building_id,
+        "period": period,
+        **charges,
+    }
+
+def parse_meter_reading_rows(body: bytes, content_type: str):
+    """解析批量抄表文件，支持 CSV（首行为字段名）和 NDJSON（每行一个 JSON 对象）"""
+    text = body.decode("utf-8-sig")
+    if content_type and content_type.startswith("text/csv"):
+        # 空单元格视为未填写
+        return [
+            {key: value for key, value in row.items() if value not in ("", None)}
+            for row in csv.DictReader(io.StringIO(text))
+        ]
+
+    rows = []
+    for line_no, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            rows.append(json.loads(line))
+        except ValueError:
+            raise ValueError(f"第 {line_no} 行不是有效的 JSON")
+    return rows
+
+def apply_meter_readings_bulk(db: Session, raw_rows: list, building_id: int = None, period: str = None):
+    """批量录入水电读数并计算费用，读数不合理的行记录在错误报告中，不影响其他行
+
+    每行通过 bill_id 定位账单，或通过 room_number（需指定 building_id）定位该房间
+    有效合同在 period（默认当月）的账单。行号从 1 开始。
+    """
+    period = period or date.today().strftime("%Y-%m")
+    errors = []
+    readings = []
+
+    for row_no, raw in enumerate(raw_rows, start=1):
+        try:
+            reading = MeterReadingRow.model_validate(raw)
+        except ValidationError as e:
+            first = e.errors()[0]
+            field = ".".join(str(loc) for loc in first["loc"])
+            errors.append({"row": row_no, "detail": f"{field}: {first['msg']}"})
+            continue
+        if reading.bill_id is None and (reading.room_number is None or building_id is None):
+            errors.append({"row": row_no, "detail": "bill_id or room_number with building_id is required"})
+            continue
+        readings.append((row_no, reading))
+
+    # 一次查询定位所有账单
+    bill_ids = {r.bill_id for _, r in readings if r.bill_id is not None}
+    room_numbers = {r.room_number for _, r in readings if r.bill_id is None}
+    conditions = []
+    if bill_ids:
+        conditions.append(Bill.id.in_(bill_ids))
+    if room_numbers:
+        conditions.append(and_(
+            Room.building_id == building_id,
+            Room.room_number.in_(room_numbers),
+            Lease.status == "Active",
+            Bill.period == period,
+        ))
+
+    by_id = {}
+    by_room_number = {}
+    if conditions:
+        found = db.query(
+            Bill.id, Bill.lease_id, Bill.rent_fee, Bill.total_amount, Bill.status, Bill.period, Bill.due_date,
+            Lease.room_id, Lease.tenant_id, Lease.status.label("lease_status"), Room.room_number, Room.building_id
+        ) \
+            .join(Lease, Bill.lease_id == Lease.id) \
+            .join(Room, Lease.room_id == Room.id) \
+            .filter(or_(*conditions)).all()
+        for row in found:
+            by_id[row.id] = row
+            if row.building_id == building_id and row.period == period and row.lease_status == "Active":
+                by_room_number[row.room_number] = row
+
+    # 一次性锁定涉及的房间
+    room_ids = {row.room_id for row in by_id.values()}
+    last_readings = {
+        room.id: [room.last_water_reading or 0.0, room.last_elec_reading or 0.0]
+        for room in db.query(Room.id, Room.last_water_reading, Room.last_elec_reading)
+        .filter(Room.id.in_(room_ids)).with_for_update().all()
+    } if room_ids else {}
+
+    bill_updates = {}
+    history = []
+    read_at = datetime.now()
+    tariffs = tariff_cache.tables(db)
+    for row_no, reading in readings:
+        target = by_id.get(reading.bill_id) if reading.bill_id is not None else by_room_number.get(reading.room_number)
+        if target is None:
+            errors.append({"row": row_no, "detail": "Bill not found"})
+            continue
+
+        last_water, last_elec = last_readings[target.room_id]
+        # 验证读数合理性
+        if reading.current_water_reading < last_water:
+            errors.append({"row": row_no, "detail": "当前水表读数不能小于上次读数"})
+            continue
+        if reading.current_elec_reading < last_elec:
+            errors.append({"row": row_no, "detail": "当前电表读数不能小于上次读数"})
+            continue
+
+        # 计算水电费
+        water_usage = reading.current_water_reading - last_water
+        elec_usage = reading.current_elec_reading - last_elec
+        water_fee = tariff_cache.charge(tariffs, target.building_id, "water", target.period, water_usage)
+        elec_fee = tariff_cache.charge(tariffs, target.building_id, "elec", target.period, elec_usage)
+        bill_updates[target.id] = {
+            "id": target.id,
+            "water_usage": water_usage,
+            "elec_usage": elec_usage,
+            "water_fee": water_fee,
+            "elec_fee": elec_fee,
+            "total_amount": target.rent_fee + water_fee + elec_fee,
+        }
+        last_readings[target.room_id] = [reading.current_water_reading, reading.current_elec_reading]
+        history.append({
+            "room_id": target.room_id,
+            # 同一文件中同一房间可能有多次读数，按行序错开以保证 (room_id, read_at) 唯一
+            "read_at": read_at + timedelta(microseconds=len(history)),
+            "building_id": target.building_id,
+            "bill_id": target.id,
+            "period": target.period,
+            "water_reading": reading.current_water_reading,
+            "elec_reading": reading.current_elec_reading,
+            "water_usage": water_usage,
+            "elec_usage": elec_usage,
+        })
+
+    if bill_updates:
+        # 按主键批量更新账单和房间读数
+        db.execute(update(Bill), list(bill_updates.values()))
+        updated_rooms = {row.room_id for row in by_id.values() if row.id in bill_updates}
+        db.execute(update(Room), [
+            {"id": room_id, "last_water_reading": last_readings[room_id][0], "last_elec_reading": last_readings[room_id][1]}
+            for room_id in updated_rooms
+        ])
+        db.execute(insert(MeterReading), history)
+
+        # 同步更新账单汇总
+        deltas = new_deltas()
+        for bill_id, values in bill_updates.items():
+            row = by_id[bill_id]
+            change = values["total_amount"] - (row.total_amount or 0.0)
+            add_amount_change(deltas, row.building_id, row.period, row.due_date, row.status, change)
+        apply_summary_deltas(db, deltas)
+
+        change_feed.publish(db, [
+            metered_event(
+                bill_id, by_id[bill_id].lease_id, by_id[bill_id].tenant_id, by_id[bill_id].building_id,
+                by_id[bill_id].period, {key: value for key, value in values.items() if key != "id"}
+            )
+            for bill_id, values in bill_updates.items()
+        ])
 
-    bill.status = "Paid"
     db.commit()
-    db.refresh(bill)
-    return bill
 
-def get_bill_status(bill: Bill):
-    """获取账单状态（包含逾期判断）"""
-    if bill.status == "Paid":
-        return "Paid"
-    elif date.today() > bill.due_date:
-        return "Overdue"
+    errors.sort(key=lambda e: e["row"])
+    return {"updated": len(bill_updates), "bill_ids": list(bill_updates), "errors": errors}
+
+def pay_bill(db: Session, bill_id: int, tenant_id: int = None):
+    """支付账单，返回 (BillResponse 字段字典, 是否本次支付)，账单不存在或不属于该租客时返回 (None, False)
+
+    归属校验和状态更新由一条 UPDATE ... WHERE status <> 'Paid' RETURNING 完成，
+    并发重复支付时只有一个请求会更新成功并计入汇总和发布 bill.paid 事件。不提交事务，由调用方提交。
+    """
+    conditions = [Bill.id == bill_id]
+    if tenant_id is not None:
+        conditions.append(Bill.lease_id.in_(select(Lease.id).filter(Lease.tenant_id == tenant_id)))
+    columns = bill_response_columns()
+
+    row = db.execute(
+        update(Bill).where(*conditions, Bill.status != "Paid").values(status="Paid").returning(*columns),
+        execution_options={"synchronize_session": False}
+    ).mappings().first()
+
+    if row is None:
+        # 账单不存在、不属于该租客，或已经支付过
+        row = db.execute(select(*columns).filter(*conditions)).mappings().first()
+        return (BillResponse.model_validate(row).model_dump() if row else None), False
+
+    # SQLite 的 RETURNING 会把整数值的 REAL 列返回为整数，经 schema 校验统一为浮点数
+    bill = BillResponse.model_validate(row).model_dump()
+    # 同步更新账单汇总
+    apply_lease_payment(db, bill["lease_id"], bill["period"], bill["due_date"], bill["total_amount"])
+    # 通知订阅者，随事务提交送达
+    owner = db.execute(
+        select(Lease.tenant_id, Room.building_id).join(Room, Lease.room_id == Room.id).filter(Lease.id == bill["lease_id"])
+    ).first()
+    change_feed.publish(db, [{
+        "type": "bill.paid",
+        "bill_id": bill["id"],
+        "lease_id": bill["lease_id"],
+        "tenant_id": owner.tenant_id,
+        "building_id": owner.building_id,
+        "period": bill["period"],
+        "total_amount": bill["total_amount"],
+    }])
+    return bill, True
+
+def bill_response_columns() -> list:
+    """BillResponse 对应的账单列，status 为包含逾期判断的当前状态
+
+    逾期判断使用构建时的当天日期，因此每次查询时调用，不能在模块导入时缓存。
+    """
+    return response_columns(BillResponse, Bill, {"status": Bill.current_status})
+
+def bill_status_clause(status: str, model=Bill):
+    """按展示状态过滤账单的 SQL 条件，可命中 (status, due_date) 索引
+
+    model 可以是 Bill 或 BillArchive。
+    """
+    today = date.today()
+    if status == "Overdue":
+        return and_(model.status == "Pending", model.due_date < today)
+    elif status == "Pending":
+        return and_(model.status == "Pending", model.due_date >= today)
     else:
-        return "Pending"
\ No newline at end of file
+        return model.status == status
+
+def bill_period_clauses(period_from: str = None, period_to: str = None, model=Bill) -> list:
+    """按账期范围（含两端）过滤账单的 SQL 条件"""
+    clauses = []
+    if period_from:
+        clauses.append(model.period >= period_from)
+    if period_to:
+        clauses.append(model.period <= period_to)
+    return clauses
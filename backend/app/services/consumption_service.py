@@ -0,0 +1,72 @@
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import and_, func, or_, select
+from app.models import MeterReading
+
+# 可用于分组统计的维度
+CONSUMPTION_GROUPS = {
+    "building": MeterReading.building_id,
+    "room": MeterReading.room_id,
+    "period": MeterReading.period,
+}
+
+def reading_conditions(building_id: int = None, room_id: int = None, date_from: date = None, date_to: date = None):
+    """读数的过滤条件，日期区间包含首尾两天，可命中 (room_id, read_at) 主键或 (building_id, read_at) 索引"""
+    conditions = []
+    if room_id:
+        conditions.append(MeterReading.room_id == room_id)
+    if building_id:
+        conditions.append(MeterReading.building_id == building_id)
+    if date_from:
+        conditions.append(MeterReading.read_at >= datetime.combine(date_from, time.min))
+    if date_to:
+        conditions.append(MeterReading.read_at < datetime.combine(date_to + timedelta(days=1), time.min))
+    return conditions
+
+def consumption_query(group_by: list, conditions: list):
+    """按 group_by 中的维度汇总用水、用电量"""
+    columns = [CONSUMPTION_GROUPS[name].label(f"{name}_id" if name != "period" else name) for name in group_by]
+    return select(
+        *columns,
+        func.count().label("reading_count"),
+        func.coalesce(func.sum(MeterReading.water_usage), 0.0).label("water_usage"),
+        func.coalesce(func.sum(MeterReading.elec_usage), 0.0).label("elec_usage"),
+    ).filter(*conditions).group_by(*columns).order_by(*columns)
+
+def anomaly_query(
+    building_id: int = None,
+    room_id: int = None,
+    date_from: date = None,
+    date_to: date = None,
+    window: int = 6,
+    factor: float = 2.0,
+):
+    """找出用量超过该房间此前 window 次读数平均值 factor 倍的读数
+
+    用窗口函数计算每次读数之前的滑动平均。读数按月录入，
+    因此只需额外读取 date_from 之前约 window 个月的历史。
+    """
+    lookback_from = date_from - timedelta(days=31 * window) if date_from else None
+    trailing = lambda column: func.avg(column).over(
+        partition_by=MeterReading.room_id,
+        order_by=MeterReading.read_at,
+        rows=(-window, -1),
+    )
+    readings = select(
+        MeterReading.room_id,
+        MeterReading.building_id,
+        MeterReading.read_at,
+        MeterReading.period,
+        MeterReading.water_usage,
+        MeterReading.elec_usage,
+        trailing(MeterReading.water_usage).label("water_trailing_avg"),
+        trailing(MeterReading.elec_usage).label("elec_trailing_avg"),
+    ).filter(*reading_conditions(building_id, room_id, lookback_from, date_to)).subquery()
+
+    r = readings.c
+    water_spike = and_(r.water_trailing_avg.is_not(None), r.water_usage > r.water_trailing_avg * factor)
+    elec_spike = and_(r.elec_trailing_avg.is_not(None), r.elec_usage > r.elec_trailing_avg * factor)
+    query = select(readings, water_spike.label("water_spike"), elec_spike.label("elec_spike")) \
+        .filter(or_(water_spike, elec_spike))
+    if date_from:
+        query = query.filter(r.read_at >= datetime.combine(date_from, time.min))
+    return query.order_by(r.room_id, r.read_at)
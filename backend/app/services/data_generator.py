@@ -0,0 +1,234 @@
+import csv
+import io
+import random
+from datetime import date, datetime, time
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.models import Building, Room, Tenant, Lease, Bill, BillArchive, MeterReading
+from app.services.bill_service import build_bill_rows, limit_to_horizon, WATER_UNIT_PRICE, ELEC_UNIT_PRICE
+from app.services.summary_service import rebuild_billing_summary
+
+# 使用自增主键的表
+SERIAL_MODELS = (Building, Room, Tenant, Lease, Bill)
+# 写入顺序需满足外键依赖
+LOAD_ORDER = SERIAL_MODELS + (MeterReading,)
+
+LEASE_TERMS = (6, 12, 12, 12, 24)  # 月，12 个月的合同最常见
+STREETS = ("Main Street", "Oak Avenue", "Pine Road", "Maple Lane", "Cedar Boulevard", "Elm Street")
+
+class BulkLoader:
+    """按表缓冲行数据并分批写入：PostgreSQL 使用 COPY，其他数据库使用 executemany"""
+
+    def __init__(self, engine: Engine, chunk_size: int = 50000):
+        self.engine = engine
+        self.chunk_size = chunk_size
+        self.buffers = {model: [] for model in LOAD_ORDER}
+        self.counts = {model: 0 for model in LOAD_ORDER}
+        self.use_copy = engine.dialect.name == "postgresql"
+
+    def add(self, model, row: dict):
+        buffer = self.buffers[model]
+        buffer.append(row)
+        if len(buffer) >= self.chunk_size:
+            # 先写入父表，保证外键引用的行已存在
+            self.flush()
+
+    def flush(self):
+        with self.engine.begin() as conn:
+            for model in LOAD_ORDER:
+                rows = self.buffers[model]
+                if not rows:
+                    continue
+                if self.use_copy:
+                    self._copy(conn, model.__table__, rows)
+                else:
+                    conn.execute(insert(model.__table__), rows)
+                self.counts[model] += len(rows)
+                self.buffers[model] = []
+
+    def _copy(self, conn, table, rows):
+        columns = list(rows[0])
+        data = io.StringIO()
+        writer = csv.writer(data)
+        for row in rows:
+            writer.writerow(["" if row[c] is None else row[c] for c in columns])
+        data.seek(0)
+        cursor = conn.connection.driver_connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", data
+            )
+        finally:
+            cursor.close()
+
+    def reset_sequences(self):
+        """显式指定主键写入后，将 PostgreSQL 序列调整到当前最大值"""
+        if not self.use_copy:
+            return
+        with self.engine.begin() as conn:
+            for model in SERIAL_MODELS:
+                table = model.__tablename__
+                high = f"(SELECT MAX(id) FROM {table})"
+                if model is Bill:
+                    # 归档账单的 id 也不能再分配
+                    high = f"GREATEST({high}, (SELECT MAX(id) FROM bills_archive))"
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE({high}, 1))"
+                ))
+
+def next_ids(engine: Engine):
+    """各表下一个可用主键，便于在已有数据之后追加"""
+    with engine.connect() as conn:
+        ids = {
+            model: (conn.execute(select(func.max(model.id))).scalar() or 0) + 1
+            for model in SERIAL_MODELS
+        }
+        # 归档账单保留原 id，新账单需避开
+        archived = conn.execute(select(func.max(BillArchive.id))).scalar() or 0
+        ids[Bill] = max(ids[Bill], archived + 1)
+        return ids
+
+def generate_portfolio(
+    engine: Engine,
+    buildings: int = 10,
+    rooms_per_building: int = 100,
+    leases: int = 3000,
+    years: int = 5,
+    seed: int = 42,
+    as_of: date = None,
+    paid_ratio: float = 0.9,
+    metered_ratio: float = 0.7,
+    occupancy: float = 0.9,
+    chunk_size: int = 50000,
+    progress=None,
+):
+    """生成楼宇、房间、租客、合同和多年账单，结果只取决于 seed 和 as_of
+
+    每个房间从 as_of 向前排布若干份首尾相接的合同（最早不超过 years 年前），
+    按 occupancy 比例的房间当前有有效合同。
+    截止日已过的账单按 paid_ratio 标记为已支付，其余保持待支付（即逾期）；
+    按 metered_ratio 为账单录入递增的水电读数，并在账期最后一天写入读数历史。
+    """
+    rng = random.Random(seed)
+    as_of = as_of or date.today()
+    history_start = (as_of - relativedelta(years=years)).replace(day=1)
+    total_rooms = buildings * rooms_per_building
+    ids = next_ids(engine)
+    loader = BulkLoader(engine, chunk_size)
+
+    for b in range(buildings):
+        building_id = ids[Building] + b
+        loader.add(Building, {
+            "id": building_id,
+            "name": f"Building {building_id}",
+            "address": f"{rng.randint(1, 999)} {rng.choice(STREETS)}",
+        })
+
+    lease_id = ids[Lease]
+    bill_id = ids[Bill]
+    for r in range(total_rooms):
+        room_id = ids[Room] + r
+        building_id = ids[Building] + r // rooms_per_building
+        area = round(rng.uniform(30.0, 120.0), 1)
+        base_rent = round(area * rng.uniform(40.0, 80.0), -1)
+        water_reading = round(rng.uniform(0.0, 200.0), 1)
+        elec_reading = round(rng.uniform(0.0, 2000.0), 1)
+
+        # 将合同总数均匀分配到各房间，从基准日期向前排布首尾相接的合同
+        lease_count = leases // total_rooms + (1 if r < leases % total_rooms else 0)
+        terms = []
+        if lease_count and rng.random() < occupancy:
+            # 当前有效合同
+            term = rng.choice(LEASE_TERMS)
+            start = as_of.replace(day=1) - relativedelta(months=rng.randint(0, term - 1))
+        else:
+            # 房间当前空置，最近一份合同已在过去结束
+            term = rng.choice(LEASE_TERMS)
+            start = as_of.replace(day=1) - relativedelta(months=term + rng.randint(1, 3))
+        while len(terms) < lease_count and start >= history_start:
+            terms.append((start, start + relativedelta(months=term)))
+            term = rng.choice(LEASE_TERMS)
+            # 合同之间可能有空置期
+            start = start - relativedelta(months=term + rng.choice((0, 0, 0, 1, 2)))
+
+        status = "Vacant"
+        # 房间状态和最终读数在排完合同后才确定，先暂存子表数据，房间行写入后再写入
+        pending_rows = []
+        readings = []
+        for start, end in reversed(terms):
+            active = start <= as_of < end
+            rent = round(base_rent * rng.uniform(0.95, 1.10), -1)
+            pending_rows.append((Tenant, {
+                "id": lease_id,
+                "name": f"Tenant {lease_id}",
+                "phone": f"13{rng.randint(0, 999999999):09d}",
+            }))
+            pending_rows.append((Lease, {
+                "id": lease_id,
+                "room_id": room_id,
+                "tenant_id": lease_id,
+                "start_date": start,
+                "end_date": end,
+                "rent_amount": rent,
+                "deposit": rent * 2,
+                "status": "Active" if active else "Terminated",
+            }))
+            for bill in limit_to_horizon(build_bill_rows(lease_id, start, end, rent, today=as_of), as_of):
+                if rng.random() < metered_ratio and bill["due_date"] <= as_of:
+                    water_usage = round(rng.uniform(2.0, 15.0), 1)
+                    elec_usage = round(rng.uniform(50.0, 400.0), 1)
+                    water_reading += water_usage
+                    elec_reading += elec_usage
+                    bill["water_usage"] = water_usage
+                    bill["elec_usage"] = elec_usage
+                    bill["water_fee"] = water_usage * WATER_UNIT_PRICE
+                    bill["elec_fee"] = elec_usage * ELEC_UNIT_PRICE
+                    bill["total_amount"] = bill["rent_fee"] + bill["water_fee"] + bill["elec_fee"]
+                    period_start = date.fromisoformat(bill["period"] + "-01")
+                    readings.append({
+                        "room_id": room_id,
+                        "read_at": datetime.combine(period_start + relativedelta(months=1, days=-1), time(9)),
+                        "building_id": building_id,
+                        "bill_id": bill_id,
+                        "period": bill["period"],
+                        "water_reading": round(water_reading, 1),
+                        "elec_reading": round(elec_reading, 1),
+                        "water_usage": water_usage,
+                        "elec_usage": elec_usage,
+                    })
+                if bill["due_date"] < as_of and rng.random() < paid_ratio:
+                    bill["status"] = "Paid"
+                bill["id"] = bill_id
+                bill_id += 1
+                pending_rows.append((Bill, bill))
+            if active:
+                status = "Occupied"
+            lease_id += 1
+
+        if status == "Vacant" and rng.random() < 0.03:
+            status = "Maintenance"
+        loader.add(Room, {
+            "id": room_id,
+            "building_id": building_id,
+            "room_number": f"{r % rooms_per_building // 20 + 1}{r % 20 + 1:02d}",
+            "area": area,
+            "status": status,
+            "last_water_reading": round(water_reading, 1),
+            "last_elec_reading": round(elec_reading, 1),
+        })
+        for model, row in pending_rows:
+            loader.add(model, row)
+        for row in readings:
+            loader.add(MeterReading, row)
+        if progress and (r + 1) % 1000 == 0:
+            progress(loader.counts, r + 1, total_rooms)
+
+    loader.flush()
+    loader.reset_sequences()
+
+    with Session(engine) as db:
+        rebuild_billing_summary(db)
+
+    return {model.__tablename__: count for model, count in loader.counts.items()}
@@ -0,0 +1,70 @@
+from sqlalchemy import select, union_all
+from app.models import Bill, BillArchive, Building, Lease, Room, Tenant
+from app.services.bill_service import bill_status_clause, bill_period_clauses
+
+def _bill_export_select(model, status_column, status: str, building_id: int, period_from: str, period_to: str):
+    query = select(
+        model.id.label("bill_id"),
+        model.period,
+        Room.building_id,
+        Building.name.label("building_name"),
+        Room.room_number,
+        model.lease_id,
+        Tenant.name.label("tenant_name"),
+        model.rent_fee,
+        model.water_usage,
+        model.water_fee,
+        model.elec_usage,
+        model.elec_fee,
+        model.total_amount,
+        status_column.label("status"),
+        model.due_date,
+    ).join(Lease, model.lease_id == Lease.id) \
+        .join(Room, Lease.room_id == Room.id) \
+        .join(Building, Room.building_id == Building.id) \
+        .join(Tenant, Lease.tenant_id == Tenant.id) \
+        .filter(*bill_period_clauses(period_from, period_to, model))
+    if status:
+        query = query.filter(bill_status_clause(status, model))
+    if building_id:
+        query = query.filter(Room.building_id == building_id)
+    return query
+
+def bill_export_query(
+    status: str = None,
+    building_id: int = None,
+    period_from: str = None,
+    period_to: str = None,
+    include_archive: bool = False,
+):
+    """导出账单的查询，每行带楼宇、房间和租客名称，按账单 id 排序"""
+    query = _bill_export_select(Bill, Bill.current_status, status, building_id, period_from, period_to)
+    if not include_archive:
+        return query.order_by(Bill.id)
+    archived = _bill_export_select(BillArchive, BillArchive.status, status, building_id, period_from, period_to)
+    bills = union_all(query, archived).subquery()
+    return select(bills).order_by(bills.c.bill_id)
+
+def lease_export_query(status: str = None, building_id: int = None):
+    """导出合同及租客信息的查询，按合同 id 排序"""
+    query = select(
+        Lease.id.label("lease_id"),
+        Room.building_id,
+        Building.name.label("building_name"),
+        Room.room_number,
+        Lease.tenant_id,
+        Tenant.name.label("tenant_name"),
+        Tenant.phone.label("tenant_phone"),
+        Lease.start_date,
+        Lease.end_date,
+        Lease.rent_amount,
+        Lease.deposit,
+        Lease.status,
+    ).join(Room, Lease.room_id == Room.id) \
+        .join(Building, Room.building_id == Building.id) \
+        .join(Tenant, Lease.tenant_id == Tenant.id)
+    if status:
+        query = query.filter(Lease.status == status)
+    if building_id:
+        query = query.filter(Room.building_id == building_id)
+    return query.order_by(Lease.id)
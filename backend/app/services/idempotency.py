@@ -0,0 +1,45 @@
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models import IdempotencyKey
+
+# 已保存响应的有效期，过期后同一个键视为新请求
+IDEMPOTENCY_TTL = timedelta(hours=float(os.getenv("IDEMPOTENCY_TTL_HOURS", 24)))
+
+def get_stored_response(db: Session, tenant_id: int, key: str, request: str):
+    """查找该键已保存的响应，不存在或已过期时返回 None
+
+    同一个键用于不同请求时抛出 ValueError。
+    """
+    record = db.get(IdempotencyKey, (tenant_id, key))
+    if record is None:
+        return None
+    if record.created_at < datetime.utcnow() - IDEMPOTENCY_TTL:
+        db.delete(record)
+        db.flush()
+        return None
+    if record.request != request:
+        raise ValueError("Idempotency-Key has already been used for a different request")
+    return record
+
+def store_response(db: Session, tenant_id: int, key: str, request: str, status_code: int, body: bytes):
+    """保存响应，不提交事务，由调用方与业务写入一并提交
+
+    并发请求使用同一个键时以先提交者为准。
+    """
+    values = {
+        "tenant_id": tenant_id,
+        "key": key,
+        "request": request,
+        "status_code": status_code,
+        "response_body": body.decode(),
+        "created_at": datetime.utcnow(),
+    }
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert_fn = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        db.execute(insert_fn(IdempotencyKey).values(**values).on_conflict_do_nothing())
+    else:
+        db.execute(insert(IdempotencyKey).values(**values))
@@ -0,0 +1,131 @@
+import csv
+import io
+import json
+from pydantic import ValidationError
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+from app.events import change_feed
+from app.models import Lease, Bill, Room, Tenant
+from app.schemas import LeaseCreate
+from app.services.bill_service import build_bill_rows, limit_to_horizon
+from app.services.summary_service import new_deltas, add_new_bills, apply_summary_deltas
+from app.services.availability_service import find_batch_conflicts, occupied_on
+
+def parse_lease_rows(body: bytes, content_type: str):
+    """解析批量导入的请求体，支持 JSON 数组和 CSV（首行为字段名）"""
+    if content_type and content_type.startswith("text/csv"):
+        reader = csv.DictReader(io.StringIO(body.decode("utf-8-sig")))
+        return list(reader)
+
+    try:
+        data = json.loads(body)
+    except ValueError:
+        raise ValueError("请求体不是有效的 JSON")
+    if not isinstance(data, list):
+        raise ValueError("请求体必须是 JSON 数组")
+    return data
+
+def lease_created_event(lease_id: int, lease: LeaseCreate, building_id: int) -> dict:
+    """新合同的变更事件"""
+    return {
+        "type": "lease.created",
+        "lease_id": lease_id,
+        "room_id": lease.room_id,
+        "tenant_id": lease.tenant_id,
+        "building_id": building_id,
+        "start_date": lease.start_date,
+        "end_date": lease.end_date,
+    }
+
+def bulk_create_leases(db: Session, raw_rows: list):
+    """批量创建合同及其全部账单，单个事务内完成，返回逐行错误报告
+
+    房间和租客各用一次查询校验，合同和账单使用批量 INSERT，房间状态用一次 UPDATE 更新。
+    行号从 1 开始。
+    """
+    errors = []
+    candidates = []
+
+    for row_no, raw in enumerate(raw_rows, start=1):
+        try:
+            lease = LeaseCreate.model_validate(raw)
+        except ValidationError as e:
+            first = e.errors()[0]
+            field = ".".join(str(loc) for loc in first["loc"])
+            errors.append({"row": row_no, "detail": f"{field}: {first['msg']}"})
+            continue
+        if lease.end_date <= lease.start_date:
+            errors.append({"row": row_no, "detail": "End date must be after start date"})
+            continue
+        candidates.append((row_no, lease))
+
+    room_ids = {lease.room_id for _, lease in candidates}
+    tenant_ids = {lease.tenant_id for _, lease in candidates}
+
+    # 锁定相关房间，防止并发签约同一房间
+    rooms = {
+        room.id: room
+        for room in db.query(Room.id, Room.status, Room.building_id).filter(Room.id.in_(room_ids)).with_for_update().all()
+    } if room_ids else {}
+    existing_tenants = {
+        tenant_id for (tenant_id,) in db.query(Tenant.id).filter(Tenant.id.in_(tenant_ids)).all()
+    } if tenant_ids else set()
+
+    # 与已有有效合同重叠的行；同一批次内的重叠在下面逐行检查
+    conflicts = find_batch_conflicts(db, [lease for _, lease in candidates])
+
+    accepted = []
+    claimed = {}
+    for index, (row_no, lease) in enumerate(candidates):
+        batch_overlap = any(
+            start < lease.end_date and end > lease.start_date for start, end in claimed.get(lease.room_id, [])
+        )
+        if lease.room_id not in rooms:
+            errors.append({"row": row_no, "detail": "Room not found"})
+        elif rooms[lease.room_id].status == "Maintenance":
+            errors.append({"row": row_no, "detail": "Room is under maintenance"})
+        elif index in conflicts or batch_overlap:
+            errors.append({"row": row_no, "detail": "Room is already leased for an overlapping period"})
+        elif lease.tenant_id not in existing_tenants:
+            errors.append({"row": row_no, "detail": "Tenant not found"})
+        else:
+            claimed.setdefault(lease.room_id, []).append((lease.start_date, lease.end_date))
+            accepted.append(lease)
+    # 当前生效的合同使房间变为已租
+    occupied_rooms = {lease.room_id for lease in accepted if occupied_on(lease.start_date, lease.end_date)}
+
+    lease_ids = []
+    if accepted:
+        result = db.execute(
+            insert(Lease).returning(Lease.id, sort_by_parameter_order=True),
+            [dict(lease.dict(), status="Active") for lease in accepted]
+        )
+        lease_ids = list(result.scalars())
+
+        bill_rows = []
+        deltas = new_deltas()
+        for lease_id, lease in zip(lease_ids, accepted):
+            lease_bills = limit_to_horizon(
+                build_bill_rows(lease_id, lease.start_date, lease.end_date, lease.rent_amount)
+            )
+            add_new_bills(deltas, rooms[lease.room_id].building_id, lease_bills)
+            bill_rows.extend(lease_bills)
+        if bill_rows:
+            db.execute(insert(Bill), bill_rows)
+            apply_summary_deltas(db, deltas)
+
+        if occupied_rooms:
+            db.execute(
+                update(Room).where(Room.id.in_(occupied_rooms)).values(status="Occupied"),
+                execution_options={"synchronize_session": False}
+            )
+
+        change_feed.publish(db, [
+            lease_created_event(lease_id, lease, rooms[lease.room_id].building_id)
+            for lease_id, lease in zip(lease_ids, accepted)
+        ])
+
+    db.commit()
+
+    errors.sort(key=lambda e: e["row"])
+    return {"created": len(lease_ids), "lease_ids": lease_ids, "errors": errors}
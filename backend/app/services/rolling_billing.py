@@ -0,0 +1,110 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from sqlalchemy import func, insert, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.cache import response_cache
+from app.models import Lease, Bill, BillArchive, Room
+from app.services.availability_service import sync_room_statuses
+from app.services.bill_service import build_bill_rows, billing_horizon
+from app.services.summary_service import new_deltas, add_new_bills, apply_summary_deltas
+
+def active_lease_chunks(db: Session, chunk_size: int):
+    """按 id 顺序将有效合同切分为 (first_id, last_id) 区间，每个区间最多 chunk_size 份合同"""
+    lease_ids = db.scalars(select(Lease.id).filter(Lease.status == "Active").order_by(Lease.id)).all()
+    return [
+        (lease_ids[i], lease_ids[min(i + chunk_size, len(lease_ids)) - 1])
+        for i in range(0, len(lease_ids), chunk_size)
+    ]
+
+def materialize_bills_chunk(db: Session, first_id: int, last_id: int, horizon: str, today: date = None) -> int:
+    """为 id 在 [first_id, last_id] 内的有效合同补齐截至 horizon 账期的账单，返回新增账单数
+
+    每份合同只生成晚于已有最后账期（含已归档账单）的账单；写入时按唯一键 (lease_id, period) 忽略冲突，
+    重复执行或与其他进程并发执行都不会产生重复账单。
+    """
+    periods = union_all(
+        select(Bill.lease_id, Bill.period).filter(Bill.lease_id.between(first_id, last_id)),
+        select(BillArchive.lease_id, BillArchive.period).filter(BillArchive.lease_id.between(first_id, last_id)),
+    ).subquery()
+    latest = select(periods.c.lease_id, func.max(periods.c.period).label("last_period")) \
+        .group_by(periods.c.lease_id).subquery()
+    leases = db.execute(
+        select(Lease.id, Lease.start_date, Lease.end_date, Lease.rent_amount, Room.building_id, latest.c.last_period)
+        .join(Room, Lease.room_id == Room.id)
+        .outerjoin(latest, latest.c.lease_id == Lease.id)
+        .filter(Lease.id.between(first_id, last_id), Lease.status == "Active")
+    ).all()
+
+    rows = []
+    buildings = {}
+    for lease in leases:
+        buildings[lease.id] = lease.building_id
+        rows.extend(
+            row for row in build_bill_rows(lease.id, lease.start_date, lease.end_date, lease.rent_amount, today)
+            if row["period"] <= horizon and (lease.last_period is None or row["period"] > lease.last_period)
+        )
+    if not rows:
+        return 0
+
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert_fn = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert_fn(Bill).on_conflict_do_nothing(index_elements=["lease_id", "period"]).returning(
+            Bill.lease_id, Bill.period, Bill.due_date, Bill.total_amount, Bill.status
+        )
+        # 只为实际插入的账单累加汇总
+        inserted = [row._asdict() for row in db.execute(stmt, rows)]
+    else:
+        db.execute(insert(Bill), rows)
+        inserted = rows
+
+    deltas = new_deltas()
+    for row in inserted:
+        add_new_bills(deltas, buildings[row["lease_id"]], [row])
+    apply_summary_deltas(db, deltas)
+    db.commit()
+    return len(inserted)
+
+def run_rolling_billing(
+    engine: Engine,
+    periods: int = None,
+    today: date = None,
+    chunk_size: int = 1000,
+    workers: int = 4,
+    progress=None,
+):
+    """为所有有效合同补齐未来 periods 期账单，按合同 id 区间分块并行处理，并同步房间状态
+
+    每个分块使用独立会话并单独提交，中途失败后重新执行即可从断点继续。
+    SQLite 同一时间只允许一个写入者，此时按单线程执行。
+    """
+    today = today or date.today()
+    horizon = billing_horizon(today, periods)
+    with Session(engine) as db:
+        chunks = active_lease_chunks(db, chunk_size)
+    if engine.dialect.name == "sqlite":
+        workers = 1
+
+    def process(chunk):
+        with Session(engine) as db:
+            return materialize_bills_chunk(db, chunk[0], chunk[1], horizon, today)
+
+    created = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for done, count in enumerate(executor.map(process, chunks), 1):
+            created += count
+            if progress:
+                progress(done, len(chunks), created)
+    # 新账单会出现在 /leases?include=bills 中
+    if created:
+        response_cache.invalidate("leases")
+
+    # 提前签订的合同到期开始、合同结束后更新房间状态
+    with Session(engine) as db:
+        rooms_updated = sync_room_statuses(db, today)
+    if rooms_updated:
+        response_cache.invalidate("buildings")
+
+    return {"horizon": horizon, "chunks": len(chunks), "created": created, "rooms_updated": rooms_updated}
@@ -0,0 +1,55 @@
+from sqlalchemy import Integer, and_, column, literal_column, or_, select, table
+from sqlalchemy.orm import Session
+from app.models import Building, Room, Tenant
+
+SEARCH_MODES = ("contains", "prefix")
+SEARCH_MODE_PATTERN = "^(" + "|".join(SEARCH_MODES) + ")$"
+# SQLite 上由迁移 0007 创建的 FTS5 trigram 索引表，通过触发器与源表同步，不由模型管理
+SQLITE_SEARCH_TABLES = ("tenants_search", "rooms_search")
+# trigram 索引只能匹配不少于 3 个字符的查询
+TRIGRAM_MIN_LENGTH = 3
+
+def like_pattern(q: str, mode: str) -> str:
+    """转义 LIKE 通配符后按模式拼接"""
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%" if mode == "prefix" else f"%{escaped}%"
+
+def text_match(columns: list, q: str, mode: str):
+    """任一列匹配 q（不区分大小写）；PostgreSQL 上可命中 pg_trgm GIN 索引"""
+    pattern = like_pattern(q, mode)
+    return or_(*(column.ilike(pattern, escape="\\") for column in columns))
+
+def fts_index(name: str):
+    """SQLite FTS5 索引表，rowid 与源表主键相同"""
+    return table(name, column("rowid", Integer))
+
+def fts_match(index, q: str):
+    """index 中包含 q 的行（不区分大小写），只作为候选集，仍需 text_match 复核"""
+    phrase = '"' + q.replace('"', '""') + '"'
+    return literal_column(index.name).op("MATCH")(phrase)
+
+def use_fts(db: Session, q: str) -> bool:
+    return db.get_bind().dialect.name == "sqlite" and len(q) >= TRIGRAM_MIN_LENGTH
+
+def tenant_search_query(db: Session, columns: list, q: str, mode: str = "contains"):
+    """按姓名或电话搜索租客，返回 (查询, 排序及分页键)
+
+    SQLite 上以 FTS 索引为驱动表并按其 rowid 排序，匹配结果按 rowid 顺序流式读取，取够一页即停止。
+    """
+    query = select(*columns).filter(text_match([Tenant.name, Tenant.phone], q, mode))
+    if not use_fts(db, q):
+        return query, Tenant.id
+    index = fts_index("tenants_search")
+    return query.select_from(index).join(Tenant, Tenant.id == index.c.rowid).filter(fts_match(index, q)), index.c.rowid
+
+def room_search_query(db: Session, columns: list, q: str, mode: str = "contains"):
+    """按房间号或楼宇名称搜索房间，返回 (查询, 排序及分页键)；楼宇数量少，楼宇名称直接匹配"""
+    condition = text_match([Room.room_number], q, mode)
+    if use_fts(db, q):
+        index = fts_index("rooms_search")
+        condition = and_(Room.id.in_(select(index.c.rowid).filter(fts_match(index, q))), condition)
+    buildings = select(Building.id).filter(text_match([Building.name], q, mode))
+    query = select(*columns) \
+        .join(Building, Room.building_id == Building.id) \
+        .filter(or_(condition, Room.building_id.in_(buildings)))
+    return query, Room.id
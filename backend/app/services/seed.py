@@ -1,7 +1,10 @@
 from datetime import date, timedelta
+from sqlalchemy import text
 from sqlalchemy.orm import Session
-from app.models import Building, Room, Tenant, Lease, Bill
-from app.database import Base, engine
+from app.models import Building, Room, Tenant, Lease
+from app.database import Base, engine, run_migrations
+from app.services.search_service import SQLITE_SEARCH_TABLES
+from app.services.bill_service import generate_bills_for_lease
 
 def create_seed_data(db: Session):
     # 创建楼宇
@@ -48,38 +51,22 @@ def create_seed_data(db: Session):
     db.commit()
 
     # 生成12期账单
-    bills = []
-    current_date = start_date
-    for month in range(12):
-        period = f"{current_date.year}-{current_date.month:02d}"
-        due_date = current_date.replace(day=15)  # 每月15号为缴费截止日
-
-        bill = Bill(
-            lease_id=lease.id,
-            period=period,
-            rent_fee=3000.0,
-            water_fee=0.0,
-            elec_fee=0.0,
-            total_amount=3000.0,
-            status="Pending",
-            due_date=due_date
-        )
-        bills.append(bill)
-
-        # 下个月
-        if current_date.month == 12:
-            current_date = current_date.replace(year=current_date.year + 1, month=1)
-        else:
-            current_date = current_date.replace(month=current_date.month + 1)
-
-    db.add_all(bills)
+    generate_bills_for_lease(db, lease)
     db.commit()
 
     print("Seed data created successfully!")
 
-def init_db():
+def reset_schema():
+    """清空数据库并通过迁移重建表结构"""
     Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        # 不在模型中的表：SQLite 全文索引表和迁移版本表
+        for table in SQLITE_SEARCH_TABLES + ("alembic_version",):
+            conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+    run_migrations()
+
+def init_db():
+    reset_schema()
 
     from app.database import SessionLocal
     db = SessionLocal()
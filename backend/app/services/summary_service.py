@@ -0,0 +1,121 @@
+from collections import defaultdict
+from datetime import date
+from sqlalchemy import case, delete, func, insert, select, union_all, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models import Bill, BillArchive, BillingSummary, Lease, Room
+
+# 可累加的汇总列
+SUMMARY_COLUMNS = ("bill_count", "billed_amount", "collected_amount", "outstanding_amount")
+SUMMARY_KEYS = ("building_id", "period", "due_date")
+
+def new_deltas():
+    """创建按 (building_id, period, due_date) 聚合的增量容器"""
+    return defaultdict(lambda: dict.fromkeys(SUMMARY_COLUMNS, 0))
+
+def apply_summary_deltas(db: Session, deltas: dict):
+    """将增量累加到 billing_summary，不提交事务，由调用方与账单写入一并提交"""
+    rows = [
+        dict(zip(SUMMARY_KEYS, key), **values)
+        for key, values in deltas.items()
+        if any(values.values())
+    ]
+    if not rows:
+        return
+
+    table = BillingSummary.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert_fn = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert_fn(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(SUMMARY_KEYS),
+            set_={column: table.c[column] + stmt.excluded[column] for column in SUMMARY_COLUMNS}
+        )
+        db.execute(stmt, rows)
+        return
+
+    # 其他数据库：先更新，不存在时再插入
+    for row in rows:
+        result = db.execute(
+            update(table)
+            .where(*(table.c[key] == row[key] for key in SUMMARY_KEYS))
+            .values({column: table.c[column] + row[column] for column in SUMMARY_COLUMNS})
+        )
+        if result.rowcount == 0:
+            db.execute(insert(table).values(**row))
+
+def add_new_bills(deltas: dict, building_id: int, bill_rows: list):
+    """记录新生成账单的增量"""
+    for row in bill_rows:
+        entry = deltas[(building_id, row["period"], row["due_date"])]
+        entry["bill_count"] += 1
+        entry["billed_amount"] += row["total_amount"]
+        if row["status"] == "Paid":
+            entry["collected_amount"] += row["total_amount"]
+        else:
+            entry["outstanding_amount"] += row["total_amount"]
+
+def add_amount_change(deltas: dict, building_id: int, period: str, due_date: date, status: str, change: float):
+    """记录账单金额变化（如录入水电读数）的增量"""
+    entry = deltas[(building_id, period, due_date)]
+    entry["billed_amount"] += change
+    if status == "Paid":
+        entry["collected_amount"] += change
+    else:
+        entry["outstanding_amount"] += change
+
+def add_payment(deltas: dict, building_id: int, period: str, due_date: date, amount: float):
+    """记录账单支付的增量"""
+    entry = deltas[(building_id, period, due_date)]
+    entry["collected_amount"] += amount
+    entry["outstanding_amount"] -= amount
+
+def apply_lease_payment(db: Session, lease_id: int, period: str, due_date: date, amount: float):
+    """将合同某期账单的支付计入汇总，通过合同所在房间定位楼宇，一条 UPDATE 完成
+
+    汇总行不存在（如尚未回填）时按增量方式补建。不提交事务。
+    """
+    building_id = select(Room.building_id).join(Lease, Lease.room_id == Room.id) \
+        .filter(Lease.id == lease_id).scalar_subquery()
+    result = db.execute(
+        update(BillingSummary)
+        .where(
+            BillingSummary.building_id == building_id,
+            BillingSummary.period == period,
+            BillingSummary.due_date == due_date
+        )
+        .values(
+            collected_amount=BillingSummary.collected_amount + amount,
+            outstanding_amount=BillingSummary.outstanding_amount - amount
+        ),
+        execution_options={"synchronize_session": False}
+    )
+    if result.rowcount == 0:
+        deltas = new_deltas()
+        add_payment(deltas, db.scalar(select(building_id)), period, due_date, amount)
+        apply_summary_deltas(db, deltas)
+
+def rebuild_billing_summary(db: Session):
+    """根据 bills 和 bills_archive 表全量重建 billing_summary（用于回填或校正）"""
+    bills = union_all(
+        select(Bill.lease_id, Bill.period, Bill.due_date, Bill.total_amount, Bill.status),
+        select(BillArchive.lease_id, BillArchive.period, BillArchive.due_date,
+               BillArchive.total_amount, BillArchive.status),
+    ).subquery()
+    paid = bills.c.status == "Paid"
+    source = select(
+        Room.building_id,
+        bills.c.period,
+        bills.c.due_date,
+        func.count(),
+        func.coalesce(func.sum(bills.c.total_amount), 0.0),
+        func.coalesce(func.sum(case((paid, bills.c.total_amount), else_=0.0)), 0.0),
+        func.coalesce(func.sum(case((paid, 0.0), else_=bills.c.total_amount)), 0.0),
+    ).join(Lease, bills.c.lease_id == Lease.id) \
+        .join(Room, Lease.room_id == Room.id) \
+        .group_by(Room.building_id, bills.c.period, bills.c.due_date)
+
+    db.execute(delete(BillingSummary))
+    db.execute(insert(BillingSummary).from_select(list(SUMMARY_KEYS) + list(SUMMARY_COLUMNS), source))
+    db.commit()
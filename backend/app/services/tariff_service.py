@@ -0,0 +1,186 @@
+import bisect
+import json
+import operator
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import date
+from functools import reduce
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import case, func, or_, select, update
+from sqlalchemy.orm import Session
+from app.models import Bill, Building, Lease, Room, Tariff
+from app.services.summary_service import new_deltas, add_amount_change, apply_summary_deltas
+
+# 未配置价格表时使用的固定单价
+WATER_UNIT_PRICE = 5.0  # 5元/吨
+ELEC_UNIT_PRICE = 1.0   # 1元/度
+DEFAULT_TIERS = {
+    "water": [{"up_to": None, "unit_price": WATER_UNIT_PRICE}],
+    "elec": [{"up_to": None, "unit_price": ELEC_UNIT_PRICE}],
+}
+UTILITIES = ("water", "elec")
+# 价格表缓存的最长有效时间（秒），作为指纹检测之外的兜底
+TARIFF_CACHE_TTL = float(os.getenv("TARIFF_CACHE_TTL", 60))
+
+def period_start(period: str) -> date:
+    return date.fromisoformat(period + "-01")
+
+def first_period_from(day: date) -> str:
+    """起始日不早于 day 的第一个账期"""
+    if day.day != 1:
+        day = day.replace(day=1) + relativedelta(months=1)
+    return f"{day.year}-{day.month:02d}"
+
+def tiered_charge(usage: float, tiers: list) -> float:
+    """按阶梯计算费用"""
+    charge = 0.0
+    lower = 0.0
+    for tier in tiers:
+        upper = tier["up_to"]
+        if usage <= lower:
+            break
+        portion = usage - lower if upper is None else min(usage, upper) - lower
+        charge += portion * tier["unit_price"]
+        if upper is None:
+            break
+        lower = upper
+    return charge
+
+def tiered_charge_expression(usage, tiers: list):
+    """与 tiered_charge 等价的 SQL 表达式，用于集合式重新计费"""
+    terms = []
+    lower = 0.0
+    for tier in tiers:
+        upper = tier["up_to"]
+        if upper is None:
+            portion = case((usage > lower, usage - lower), else_=0.0)
+        else:
+            portion = case((usage <= lower, 0.0), (usage >= upper, upper - lower), else_=usage - lower)
+        terms.append(portion * tier["unit_price"])
+        if upper is None:
+            break
+        lower = upper
+    return reduce(operator.add, terms)
+
+class TariffCache:
+    """内存中的价格表
+
+    价格表很小，整表加载。每次使用前查询价格表的行数和最大 id 作为指纹，与数据库不一致时重新加载，
+    因此其他 worker 或其他主机上的修改也能立即生效；超过 TARIFF_CACHE_TTL 秒也会重新加载，
+    覆盖删除最大 id 后 SQLite 复用该 id 等指纹不变的情况。本进程修改价格表后调用 invalidate。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fingerprint = None
+        self._expires_at = 0.0
+        self._tables = {}
+
+    def tables(self, db: Session) -> dict:
+        """返回 {(building_id, utility): ([生效日期...], [阶梯...])}，按生效日期升序"""
+        fingerprint = tuple(db.execute(select(func.count(Tariff.id), func.max(Tariff.id))).one())
+        if fingerprint != self._fingerprint or time.monotonic() >= self._expires_at:
+            tables = {}
+            for tariff in db.scalars(select(Tariff).order_by(Tariff.effective_from, Tariff.id)):
+                dates, tiers = tables.setdefault((tariff.building_id, tariff.utility), ([], []))
+                dates.append(tariff.effective_from)
+                tiers.append(tariff.tiers)
+            with self._lock:
+                self._tables, self._fingerprint = tables, fingerprint
+                self._expires_at = time.monotonic() + TARIFF_CACHE_TTL
+        return self._tables
+
+    def tiers_for(self, tables: dict, building_id: int, utility: str, day: date) -> list:
+        """day 当天生效的阶梯：优先使用楼宇自己的价格表，其次默认价格表，都没有时使用固定单价"""
+        for key in ((building_id, utility), (None, utility)):
+            entry = tables.get(key)
+            if entry:
+                index = bisect.bisect_right(entry[0], day)
+                if index:
+                    return entry[1][index - 1]
+        return DEFAULT_TIERS[utility]
+
+    def charge(self, tables: dict, building_id: int, utility: str, period: str, usage: float) -> float:
+        """计算某楼宇某账期的用量费用，tables 为 self.tables() 的返回值"""
+        return tiered_charge(usage, self.tiers_for(tables, building_id, utility, period_start(period)))
+
+    def invalidate(self):
+        with self._lock:
+            self._fingerprint = None
+
+tariff_cache = TariffCache()
+
+def rating_segments(tables: dict, building_ids: list, since: date) -> dict:
+    """将 since 之后的时间按价格生效日期切分
+
+    返回 {(开始日期, 结束日期, 水费阶梯 JSON, 电费阶梯 JSON): [building_id, ...]}，
+    结束日期为 None 表示不设上限；同一区间价格相同的楼宇合并为一组。
+    """
+    default_dates = {d for utility in UTILITIES for d in tables.get((None, utility), ([], []))[0]}
+    groups = defaultdict(list)
+    for building_id in building_ids:
+        dates = {since} | {d for d in default_dates if d > since}
+        for utility in UTILITIES:
+            dates.update(d for d in tables.get((building_id, utility), ([], []))[0] if d > since)
+        bounds = sorted(dates)
+        for begin, end in zip(bounds, bounds[1:] + [None]):
+            water = tariff_cache.tiers_for(tables, building_id, "water", begin)
+            elec = tariff_cache.tiers_for(tables, building_id, "elec", begin)
+            groups[(begin, end, json.dumps(water), json.dumps(elec))].append(building_id)
+    return groups
+
+def _summary_totals(db: Session, conditions: list) -> dict:
+    """按 (building_id, period, due_date) 汇总账单金额"""
+    rows = db.execute(
+        select(Room.building_id, Bill.period, Bill.due_date, func.sum(Bill.total_amount))
+        .join(Lease, Bill.lease_id == Lease.id)
+        .join(Room, Lease.room_id == Room.id)
+        .filter(*conditions)
+        .group_by(Room.building_id, Bill.period, Bill.due_date)
+    ).all()
+    return {(building_id, period, due_date): total for building_id, period, due_date, total in rows}
+
+def rerate_unpaid_bills(db: Session, building_id: int = None, since: date = None) -> int:
+    """按当前价格表重新计算未支付账单的水电费和总额，返回更新的账单数
+
+    只处理账期起始日不早于 since 的已抄表账单。价格相同的楼宇和账期区间合并为一条 UPDATE，
+    阶梯计费在数据库中用 CASE 表达式完成；账单汇总按更新前后的金额差同步调整。
+    """
+    tables = tariff_cache.tables(db)
+    building_ids = [building_id] if building_id else db.scalars(select(Building.id)).all()
+    since = since or date(1900, 1, 1)
+
+    updated = 0
+    deltas = new_deltas()
+    for (begin, end, water_json, elec_json), buildings in rating_segments(tables, building_ids, since).items():
+        conditions = [
+            Bill.status != "Paid",
+            Bill.period >= first_period_from(begin),
+            or_(Bill.water_usage > 0, Bill.elec_usage > 0),
+            Bill.lease_id.in_(
+                select(Lease.id).join(Room, Lease.room_id == Room.id).filter(Room.building_id.in_(buildings))
+            ),
+        ]
+        if end is not None:
+            conditions.append(Bill.period < first_period_from(end))
+
+        before = _summary_totals(db, conditions)
+        water_fee = tiered_charge_expression(Bill.water_usage, json.loads(water_json))
+        elec_fee = tiered_charge_expression(Bill.elec_usage, json.loads(elec_json))
+        result = db.execute(
+            update(Bill).where(*conditions).values(
+                water_fee=water_fee,
+                elec_fee=elec_fee,
+                total_amount=Bill.rent_fee + water_fee + elec_fee,
+            ),
+            execution_options={"synchronize_session": False}
+        )
+        updated += result.rowcount
+        for key, total in _summary_totals(db, conditions).items():
+            add_amount_change(deltas, *key, "Pending", total - before.get(key, 0.0))
+
+    apply_summary_deltas(db, deltas)
+    db.commit()
+    return updated
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""归档已支付的历史账单：将账期早于分界账期的已支付账单移入 bills_archive，可重复执行，适合由 cron 定期调用
+
+    python archive_bills.py --months 24
+"""
+import argparse
+import sys
+import time
+from datetime import date
+from sqlalchemy.orm import Session
+from app.database import engine
+from app.services.archive_service import BILL_ARCHIVE_MONTHS, archive_cutoff, archive_settled_bills
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move settled bills older than the horizon into bills_archive")
+    parser.add_argument("--months", type=int, default=BILL_ARCHIVE_MONTHS, help="保留在线的月数，早于此的已支付账单被归档")
+    parser.add_argument("--as-of", type=date.fromisoformat, default=date.today(), help="基准日期 YYYY-MM-DD")
+    parser.add_argument("--batch-size", type=int, default=2000, help="每个事务归档的账单数")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    cutoff = archive_cutoff(args.as_of, args.months)
+
+    def progress(archived):
+        print(f"\r{archived} bills archived, {time.perf_counter() - started:.0f}s", end="", file=sys.stderr)
+
+    with Session(engine) as db:
+        archived = archive_settled_bills(db, cutoff, batch_size=args.batch_size, progress=progress)
+    print(file=sys.stderr)
+    print(f"Archived {archived} paid bills before {cutoff}")
+    print(f"Done in {time.perf_counter() - started:.1f}s")
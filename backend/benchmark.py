@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""接口基准测试：通过 ASGI 直接驱动各路由，统计延迟分位数、吞吐量和每请求 SQL 次数
+
+用法：
+    python benchmark.py                                   # 使用临时 SQLite 数据库
+    python benchmark.py --database-url postgresql://...   # 使用本地 PostgreSQL（会清空数据）
+    python benchmark.py --concurrency 1,8,32 --requests 200 --output bench.json
+
+JSON 结果包含提交号，便于跨提交比较。
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="PropManage API benchmark")
+    parser.add_argument("--database-url", help="数据库 URL，默认使用临时 SQLite 文件（数据会被清空）")
+    parser.add_argument("--concurrency", default="1,8,32", help="并发级别，逗号分隔")
+    parser.add_argument("--requests", type=int, default=200, help="每个接口在每个并发级别下的请求数")
+    parser.add_argument("--only", help="只运行名称包含该字符串的用例")
+    parser.add_argument("--output", help="将 JSON 结果写入该文件")
+    return parser.parse_args()
+
+args = parse_args()
+
+# 必须在导入应用之前设置
+os.environ["DATABASE_URL"] = args.database_url or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["SQL_METRICS_HEADERS"] = "1"
+
+import httpx
+from sqlalchemy import func
+from app import models
+from app.database import SessionLocal
+from app.main import app
+from app.services.seed import init_db
+from app.services.lease_service import bulk_create_leases
+
+# 批量接口每次请求的行数
+BULK_LEASES = 5
+BULK_READINGS = 10
+
+def prepare_fixture(capacity: int):
+    """创建基准测试数据：每个写接口每次请求使用不同的房间/租客/账单，避免互相冲突"""
+    init_db()
+    db = SessionLocal()
+    try:
+        building = models.Building(name="Bench Building", address="Bench Road")
+        db.add(building)
+        db.flush()
+
+        leased_rooms = [
+            models.Room(building_id=building.id, room_number=f"L-{i}", area=50.0, status="Vacant",
+                        last_water_reading=0.0, last_elec_reading=0.0)
+            for i in range(capacity)
+        ]
+        vacant_rooms = [
+            models.Room(building_id=building.id, room_number=f"V-{i}", area=50.0, status="Vacant",
+                        last_water_reading=0.0, last_elec_reading=0.0)
+            for i in range(capacity)
+        ]
+        bulk_rooms = [
+            models.Room(building_id=building.id, room_number=f"B-{i}", area=50.0, status="Vacant",
+                        last_water_reading=0.0, last_elec_reading=0.0)
+            for i in range(capacity)
+        ]
+        tenants = [models.Tenant(name=f"Bench Tenant {i}", phone=f"1390000{i:04d}") for i in range(capacity)]
+        db.add_all(leased_rooms + vacant_rooms + bulk_rooms + tenants)
+        db.commit()
+
+        start = date.today().replace(day=1)
+        # 供删除用例使用的价格表，生效日期在远期，不影响现有账单
+        tariffs = [
+            models.Tariff(building_id=building.id, utility="water", effective_from=start + timedelta(days=3650 + i),
+                          tiers=[{"up_to": None, "unit_price": 5.0}])
+            for i in range(capacity)
+        ]
+        db.add_all(tariffs)
+        db.commit()
+        bulk_create_leases(db, [
+            {
+                "room_id": room.id,
+                "tenant_id": tenant.id,
+                "start_date": start.isoformat(),
+                "end_date": start.replace(year=start.year + 1).isoformat(),
+                "rent_amount": 3000.0,
+                "deposit": 6000.0,
+            }
+            for room, tenant in zip(leased_rooms, tenants)
+        ])
+
+        first_bills = dict(
+            db.query(models.Lease.tenant_id, func.min(models.Bill.id))
+            .join(models.Bill).group_by(models.Lease.tenant_id).all()
+        )
+        return {
+            "building_id": building.id,
+            "tenant_ids": [tenant.id for tenant in tenants],
+            "bill_ids": [first_bills[tenant.id] for tenant in tenants],
+            "vacant_room_ids": [room.id for room in vacant_rooms],
+            "bulk_room_ids": [room.id for room in bulk_rooms],
+            "leased_room_numbers": [room.room_number for room in leased_rooms],
+            "tariff_ids": [tariff.id for tariff in tariffs],
+            "any_tenant_id": tenants[0].id,
+            "any_bill_id": first_bills[tenants[0].id],
+            "any_lease_id": db.query(func.min(models.Lease.id)).scalar(),
+            "any_room_id": leased_rooms[0].id,
+        }
+    finally:
+        db.close()
+
+def bulk_leases(fx, i, start):
+    """第 i 次批量导入：在同一房间上依次创建 BULK_LEASES 份互不重叠的一年期合同"""
+    return [
+        {
+            "room_id": fx["bulk_room_ids"][i],
+            "tenant_id": fx["tenant_ids"][i],
+            "start_date": start.replace(year=start.year + k).isoformat(),
+            "end_date": start.replace(year=start.year + k + 1).isoformat(),
+            "rent_amount": 3000.0,
+            "deposit": 6000.0,
+        }
+        for k in range(BULK_LEASES)
+    ]
+
+def bulk_readings(fx, i):
+    """第 i 次批量抄表：按房间号为 BULK_READINGS 个房间录入当月读数，读数随 i 递增"""
+    numbers = fx["leased_room_numbers"]
+    return b"".join(
+        json.dumps({
+            "room_number": numbers[(i * BULK_READINGS + k) % len(numbers)],
+            "current_water_reading": 1000.0 + i,
+            "current_elec_reading": 2000.0 + i,
+        }).encode() + b"\n"
+        for k in range(BULK_READINGS)
+    )
+
+def build_cases(fx):
+    """所有路由的基准用例：(名称, 生成请求的函数[, 流式])
+
+    生成函数返回 (方法, 路径, 请求头, 请求体)，i 为全局递增序号；请求体为 bytes 时原样发送。
+    流式用例只读取第一个响应分块后断开连接，SSE 等不会结束的流也能计时。
+    """
+    landlord = {"X-Role": "landlord"}
+    tenant = {"X-Tenant-Id": str(fx["any_tenant_id"])}
+    ndjson = {**landlord, "Content-Type": "application/x-ndjson"}
+    start = date.today().replace(day=1)
+    next_year = start.replace(year=start.year + 1)
+    building = fx["building_id"]
+    reading_range = f"building_id={building}&date_from={start}&date_to={next_year}"
+    return [
+        ("GET /buildings", lambda i: ("GET", "/api/buildings", {}, None)),
+        ("GET /buildings/{id}", lambda i: ("GET", f"/api/buildings/{fx['building_id']}", {}, None)),
+        ("GET /buildings/summary", lambda i: ("GET", "/api/buildings/summary", {}, None)),
+        ("POST /buildings", lambda i: ("POST", "/api/buildings", {}, {"name": f"B{i}", "address": "x"})),
+        ("GET /tenants", lambda i: ("GET", "/api/tenants", {}, None)),
+        ("GET /tenants/{id}", lambda i: ("GET", f"/api/tenants/{fx['any_tenant_id']}", {}, None)),
+        ("POST /tenants", lambda i: ("POST", "/api/tenants", {}, {"name": f"T{i}", "phone": "1"})),
+        ("GET /tenants/search", lambda i: ("GET", "/api/tenants/search?q=tenant%201", {}, None)),
+        ("GET /rooms/search", lambda i: ("GET", "/api/rooms/search?q=V-1&mode=prefix", {}, None)),
+        ("GET /rooms/vacant", lambda i: ("GET", f"/api/rooms/vacant?start_date={start}&end_date={next_year}"
+                                                f"&building_id={building}", {}, None)),
+        ("GET /rooms/{id}/availability", lambda i: ("GET", f"/api/rooms/{fx['any_room_id']}/availability", {}, None)),
+        ("GET /leases", lambda i: ("GET", "/api/leases", landlord, None)),
+        ("GET /leases/{id}?include=bills", lambda i: ("GET", f"/api/leases/{fx['any_lease_id']}?include=room,tenant,bills",
+                                                      landlord, None)),
+        ("POST /leases", lambda i: ("POST", "/api/leases", landlord, {
+            "room_id": fx["vacant_room_ids"][i],
+            "tenant_id": fx["tenant_ids"][i],
+            "start_date": start.isoformat(),
+            "end_date": start.replace(year=start.year + 1).isoformat(),
+            "rent_amount": 3000.0,
+            "deposit": 6000.0,
+        })),
+        ("POST /leases/bulk", lambda i: ("POST", "/api/leases/bulk", landlord, bulk_leases(fx, i, start))),
+        ("GET /bills", lambda i: ("GET", "/api/bills", landlord, None)),
+        ("GET /bills?limit=50", lambda i: ("GET", "/api/bills?limit=50", landlord, None)),
+        ("GET /bills?status=Overdue", lambda i: ("GET", "/api/bills?status=Overdue", landlord, None)),
+        ("GET /bills/stream", lambda i: ("GET", "/api/bills/stream", landlord, None)),
+        ("GET /bills/{id}", lambda i: ("GET", f"/api/bills/{fx['any_bill_id']}", landlord, None)),
+        ("POST /bills/{id}/meter-reading", lambda i: ("POST", f"/api/bills/{fx['bill_ids'][i]}/meter-reading", landlord, {
+            "current_water_reading": 10.0,
+            "current_elec_reading": 20.0,
+        })),
+        ("POST /bills/meter-readings", lambda i: ("POST", f"/api/bills/meter-readings?building_id={building}",
+                                                  ndjson, bulk_readings(fx, i))),
+        ("GET /tariffs", lambda i: ("GET", "/api/tariffs", landlord, None)),
+        ("POST /tariffs", lambda i: ("POST", "/api/tariffs", landlord, {
+            "building_id": building,
+            "utility": "elec",
+            "effective_from": (start + timedelta(days=3650 + i)).isoformat(),
+            "tiers": [{"up_to": None, "unit_price": 1.0}],
+        })),
+        ("DELETE /tariffs/{id}", lambda i: ("DELETE", f"/api/tariffs/{fx['tariff_ids'][i]}", landlord, None)),
+        ("POST /tariffs/rerate", lambda i: ("POST", f"/api/tariffs/rerate?building_id={building}&since={start}",
+                                            landlord, None)),
+        ("GET /export/bills", lambda i: ("GET", "/api/export/bills", landlord, None), True),
+        ("GET /export/leases", lambda i: ("GET", "/api/export/leases?format=xlsx", landlord, None), True),
+        ("GET /events", lambda i: ("GET", "/api/events", landlord, None), True),
+        ("GET /analytics/billing", lambda i: ("GET", "/api/analytics/billing", landlord, None)),
+        ("GET /analytics/meter-readings", lambda i: ("GET", f"/api/analytics/meter-readings?{reading_range}",
+                                                     landlord, None)),
+        ("GET /analytics/consumption", lambda i: ("GET", f"/api/analytics/consumption?{reading_range}", landlord, None)),
+        ("GET /analytics/consumption/anomalies", lambda i: ("GET", f"/api/analytics/consumption/anomalies?{reading_range}",
+                                                            landlord, None)),
+        ("GET /my/lease", lambda i: ("GET", "/api/my/lease", tenant, None)),
+        ("GET /my/bills", lambda i: ("GET", "/api/my/bills", tenant, None)),
+        ("GET /my/summary", lambda i: ("GET", "/api/my/summary", tenant, None)),
+        ("POST /my/bills/{id}/pay", lambda i: ("POST", f"/api/my/bills/{fx['bill_ids'][i]}/pay",
+                                               {"X-Tenant-Id": str(fx["tenant_ids"][i])}, None)),
+    ]
+
+def percentile(sorted_values, pct):
+    """最近秩法计算分位数"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+async def request_first_chunk(method, path, headers):
+    """直接调用 ASGI 应用，收到第一个响应分块后模拟客户端断开，返回 (状态码, 响应头)
+
+    httpx 的 ASGITransport 会等待整个响应结束，不适用于流式导出和 SSE。
+    """
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method, "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": query.encode(), "root_path": "",
+        "headers": [(key.lower().encode(), value.encode()) for key, value in headers.items()],
+        "client": ("bench", 0), "server": ("bench", 80),
+    }
+    disconnected = asyncio.Event()
+    request_sent = False
+    status, response_headers = None, {}
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            response_headers.update((key.decode(), value.decode()) for key, value in message["headers"])
+        elif message.get("body"):
+            disconnected.set()
+
+    await app(scope, receive, send)
+    return status, response_headers
+
+async def run_case(client, make_request, streamed, counter, total, concurrency):
+    """以固定并发执行 total 个请求，返回统计结果"""
+    latencies = []
+    queries = []
+    errors = 0
+    pending = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in pending:
+            method, path, headers, body = make_request(next(counter))
+            started = time.perf_counter()
+            if streamed:
+                status, response_headers = await request_first_chunk(method, path, headers)
+            else:
+                content = {"content": body} if isinstance(body, bytes) else {"json": body}
+                response = await client.request(method, path, headers=headers, **content)
+                status, response_headers = response.status_code, response.headers
+            latencies.append(time.perf_counter() - started)
+            if status >= 400:
+                errors += 1
+            if "x-db-query-count" in response_headers:
+                queries.append(int(response_headers["x-db-query-count"]))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "throughput_rps": total / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "queries_per_request": sum(queries) / len(queries) if queries else 0.0,
+    }
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+async def main():
+    levels = [int(level) for level in args.concurrency.split(",")]
+    fx = prepare_fixture(args.requests * len(levels))
+    cases = [case for case in build_cases(fx) if not args.only or args.only in case[0]]
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, make_request, *streamed in cases:
+            counter = itertools.count()
+            for concurrency in levels:
+                stats = await run_case(client, make_request, bool(streamed), counter, args.requests, concurrency)
+                stats["endpoint"] = name
+                results.append(stats)
+                print(
+                    f"{name:<34} c={concurrency:<3} p50={stats['p50_ms']:8.2f}ms p95={stats['p95_ms']:8.2f}ms "
+                    f"p99={stats['p99_ms']:8.2f}ms {stats['throughput_rps']:8.1f} req/s "
+                    f"{stats['queries_per_request']:5.1f} q/req errors={stats['errors']}",
+                    file=sys.stderr,
+                )
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "database": os.environ["DATABASE_URL"].split(":", 1)[0],
+        "python": platform.python_version(),
+        "requests_per_level": args.requests,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    asyncio.run(main())
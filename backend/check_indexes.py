@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""对高频查询执行 EXPLAIN，检查每条查询都命中索引
+
+用法：python check_indexes.py（使用 DATABASE_URL，需先执行 alembic upgrade head）
+任一查询出现全表扫描时以非零状态退出。
+"""
+import re
+import sys
+from datetime import date, datetime
+from sqlalchemy import select, tuple_, text
+from sqlalchemy.orm import Session
+from app import models
+from app.database import engine
+from app.services.availability_service import overlaps, vacant_room_conditions
+from app.services.bill_service import bill_status_clause
+from app.services.search_service import tenant_search_query
+
+def hot_queries(db: Session):
+    """返回 (名称, 查询) 列表，与路由中的查询形状一致"""
+    Bill, Lease, Room, Reading = models.Bill, models.Lease, models.Room, models.MeterReading
+    return [
+        ("bills by lease_id", select(Bill).where(Bill.lease_id == 1)),
+        ("bill by (lease_id, period)", select(Bill).where(Bill.lease_id == 1, Bill.period == "2026-01")),
+        ("active lease by tenant (/my/lease)", select(Lease).where(Lease.tenant_id == 1, Lease.status == "Active")),
+        ("bills by tenant (/my/bills)", select(Bill).join(Lease).where(Lease.tenant_id == 1)),
+        ("rooms by (building_id, status)", select(Room).where(Room.building_id == 1, Room.status == "Vacant")),
+        ("bills by building (/bills?building_id=)",
+         select(Bill).join(Lease).join(Room).where(Room.building_id == 1)),
+        ("overdue bills (/bills?status=Overdue)", select(Bill).where(bill_status_clause("Overdue"))),
+        ("bills keyset page (/bills?limit=&cursor=)",
+         select(Bill).where(tuple_(Bill.due_date, Bill.id) > (date(2026, 1, 15), 1))
+         .order_by(Bill.due_date, Bill.id).limit(50)),
+        ("meter readings by room and time range",
+         select(Reading).where(Reading.room_id == 1, Reading.read_at >= datetime(2026, 1, 1))),
+        ("meter readings by building and time range",
+         select(Reading).where(Reading.building_id == 1, Reading.read_at >= datetime(2026, 1, 1))),
+        ("tenant search (/tenants/search?q=)",
+         tenant_search_query(db, [models.Tenant.id], "wang", "contains")[0]),
+        ("lease overlap by room (POST /leases)",
+         select(Lease.id).where(overlaps(date(2026, 1, 1), date(2027, 1, 1), room_id=1))),
+        ("vacant rooms (/rooms/vacant)",
+         select(Room.id).where(*vacant_room_conditions(date(2026, 1, 1), date(2027, 1, 1), building_id=1))),
+    ]
+
+def explain(conn, statement):
+    """返回执行计划文本行，并给出其中的全表扫描"""
+    compiled = statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    if conn.dialect.name == "postgresql":
+        plan = [row[0] for row in conn.execute(text(f"EXPLAIN {compiled}"))]
+        scans = [line for line in plan if "Seq Scan" in line]
+    else:
+        plan = [row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))]
+        scans = [line for line in plan if re.match(r"^SCAN \w+$", line.strip())]
+    return plan, scans
+
+def main():
+    failed = 0
+    with Session(engine) as db, engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            # 小数据量下规划器倾向顺序扫描，这里只检查索引是否可用
+            conn.execute(text("SET enable_seqscan = off"))
+        for name, statement in hot_queries(db):
+            plan, scans = explain(conn, statement)
+            status = "FAIL" if scans else "ok"
+            failed += bool(scans)
+            print(f"[{status}] {name}")
+            for line in plan:
+                print(f"       {line}")
+    if failed:
+        print(f"{failed} query(s) not using an index")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
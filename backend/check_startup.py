@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""测量 worker 启动耗时：每次在新进程中导入 app.main 并执行 lifespan 启动
+
+用法：python check_startup.py --runs 5 [--budget-ms 3000]
+取各次的中位数，超出预算，或未设置 DB_POOL_WARMUP 时启动阶段建立了数据库连接，以非零状态退出。
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from sqlalchemy import event
+
+def measure_once():
+    started = time.perf_counter()
+    from app.main import app, IMPORT_SECONDS, DB_POOL_WARMUP
+    from app.database import engine, async_engine
+    imported = time.perf_counter()
+
+    connections = []
+    for target in (engine, async_engine.sync_engine):
+        event.listen(target, "connect", lambda *args: connections.append(1))
+
+    async def boot():
+        async with app.router.lifespan_context(app):
+            return time.perf_counter()
+
+    ready = asyncio.run(boot())
+    print(json.dumps({
+        "import_ms": (imported - started) * 1000,
+        "app_import_ms": IMPORT_SECONDS * 1000,
+        "startup_ms": (ready - imported) * 1000,
+        "connections": len(connections),
+        "warmup": DB_POOL_WARMUP,
+    }))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure worker import and startup time")
+    parser.add_argument("--runs", type=int, default=5, help="测量次数，每次使用新进程")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("STARTUP_BUDGET_MS", 3000)),
+                        help="导入与启动总耗时预算（毫秒）")
+    parser.add_argument("--once", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.once:
+        measure_once()
+        sys.exit(0)
+
+    results = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--once"],
+            capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    import_ms = statistics.median(r["import_ms"] for r in results)
+    startup_ms = statistics.median(r["startup_ms"] for r in results)
+    total_ms = import_ms + startup_ms
+    print(f"import  {import_ms:.0f} ms (median of {len(results)})")
+    print(f"startup {startup_ms:.0f} ms")
+    print(f"total   {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    if total_ms > args.budget_ms:
+        print("[fail] boot is over budget")
+        failed = True
+    if any(r["connections"] and not r["warmup"] for r in results):
+        print("[fail] database connections were opened during startup")
+        failed = True
+    sys.exit(1 if failed else 0)
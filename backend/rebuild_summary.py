@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+from app.database import SessionLocal
+from app.services.summary_service import rebuild_billing_summary
+
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        rebuild_billing_summary(db)
+        print("Billing summary rebuilt successfully!")
+    finally:
+        db.close()
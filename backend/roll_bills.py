@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""滚动生成账单：为所有有效合同补齐未来若干期账单并同步房间状态，可重复执行，适合由 cron 每天调用
+
+    python roll_bills.py --periods 3 --workers 4
+"""
+import argparse
+import sys
+import time
+from datetime import date
+from app.database import engine
+from app.services.bill_service import BILLING_HORIZON
+from app.services.rolling_billing import run_rolling_billing
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Materialize upcoming bills for active leases")
+    parser.add_argument("--periods", type=int, default=BILLING_HORIZON, help="含当月在内需要生成的账期数")
+    parser.add_argument("--as-of", type=date.fromisoformat, default=date.today(), help="基准日期 YYYY-MM-DD")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="每个分块包含的合同数")
+    parser.add_argument("--workers", type=int, default=4, help="并行处理的分块数（SQLite 下固定为 1）")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+
+    def progress(done, total, created):
+        print(f"\r{done}/{total} chunks, {created} bills created, {time.perf_counter() - started:.0f}s",
+              end="", file=sys.stderr)
+
+    result = run_rolling_billing(
+        engine,
+        periods=args.periods,
+        today=args.as_of,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        progress=progress,
+    )
+    print(file=sys.stderr)
+    print(f"Horizon {result['horizon']}: {result['created']} bills created in {result['chunks']} chunks")
+    print(f"{result['rooms_updated']} room statuses updated")
+    print(f"Done in {time.perf_counter() - started:.1f}s")
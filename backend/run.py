@@ -1,3 +1,5 @@
+import argparse
+import sys
 import uvicorn
 from dotenv import load_dotenv
 import os
@@ -5,5 +7,32 @@ import os
 load_dotenv()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the PropManage Lite API")
+    parser.add_argument("--prod", action="store_true", default=os.getenv("APP_ENV") == "production",
+                        help="生产模式：多 worker、不自动重载（也可设置 APP_ENV=production）")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+                        help="生产模式下的 worker 进程数（默认 WEB_CONCURRENCY 或 CPU 核数）")
+    args = parser.parse_args()
+
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run("app.main:app", host="0.0.0.0", port=port, reload=True)
\ No newline at end of file
+    if args.prod and args.workers > 1:
+        # 进程内缓存无法跨 worker 失效，多 worker 时默认使用本机共享的 SQLite 缓存（worker 继承环境变量）
+        cache_backend = os.environ.setdefault("CACHE_BACKEND", "sqlite")
+        if cache_backend == "memory":
+            print(
+                f"WARNING: CACHE_BACKEND=memory with {args.workers} workers: cached responses may stay stale "
+                f"for up to CACHE_TTL seconds after writes handled by other workers",
+                file=sys.stderr,
+            )
+    if args.prod:
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=port,
+            workers=args.workers,
+            proxy_headers=True,
+            lifespan="on",
+            log_level=os.getenv("LOG_LEVEL", "info"),
+        )
+    else:
+        uvicorn.run("app.main:app", host="0.0.0.0", port=port, reload=True)
@@ -1,8 +1,8 @@
 import React, { useState, useEffect } from 'react';
 import { Table, Card, Button, Space, Modal, Form, InputNumber, message, Tag, Select } from 'antd';
 import { EditOutlined, CalendarOutlined, UserOutlined, HomeOutlined } from '@ant-design/icons';
-import type { Lease, Bill, Building } from '../../types';
-import { getLeases, getBills, addMeterReading, getBuildings } from '../../services/api';
+import type { Lease, Bill, Building, ChangeEvent } from '../../types';
+import { getLeases, getLease, getBills, addMeterReading, getBuildings, subscribeEvents } from '../../services/api';
 import dayjs from 'dayjs';
 
 const { Option } = Select;
@@ -33,6 +33,23 @@ const LeaseManagement: React.FC = () => {
     loadBills();
   }, [selectedBuilding, billStatus]);
 
+  // 订阅变更事件，只更新受影响的账单，不再整表刷新
+  useEffect(() => {
+    return subscribeEvents((event: ChangeEvent) => {
+      if (event.type === 'lease.created') {
+        loadLeases();
+      } else if (event.type === 'resync' || (event.type === 'bill.paid' && billStatus)) {
+        // 按状态筛选时支付会改变账单是否在列表中
+        loadBills();
+        if (event.type === 'resync') loadLeases();
+      } else {
+        const { bill_id, type, water_fee, elec_fee, total_amount } = event;
+        const patch = type === 'bill.paid' ? { status: 'Paid' } : { water_fee, elec_fee, total_amount };
+        setBills((current) => current.map((bill) => (bill.id === bill_id ? { ...bill, ...patch } as Bill : bill)));
+      }
+    }, selectedBuilding);
+  }, [selectedBuilding, billStatus]);
+
   const loadLeases = async () => {
     setLoading(true);
     try {
@@ -66,9 +83,15 @@ const LeaseManagement: React.FC = () => {
     }
   };
 
-  const handleViewBills = (lease: Lease) => {
+  const handleViewBills = async (lease: Lease) => {
+    // 合同列表不包含账单，查看时再按需加载
     setSelectedLease(lease);
     setIsBillModalVisible(true);
+    try {
+      setSelectedLease(await getLease(lease.id));
+    } catch (error) {
+      message.error('加载账单失败');
+    }
   };
 
   const handleAddMeterReading = (bill: Bill) => {
@@ -81,14 +104,15 @@ const LeaseManagement: React.FC = () => {
     if (!selectedBill) return;
 
     try {
-      await addMeterReading(selectedBill.id, {
+      const updated = await addMeterReading(selectedBill.id, {
         current_water_reading: values.current_water_reading,
         current_elec_reading: values.current_elec_reading,
       });
 
       message.success('抄表成功！');
       setIsMeterReadingModalVisible(false);
-      loadBills(); // 刷新账单数据
+      // 直接用返回的账单更新列表，其他客户端的变更仍通过事件推送
+      setBills((current) => current.map((bill) => (bill.id === updated.id ? updated : bill)));
     } catch (error: any) {
       message.error(error.response?.data?.detail || '抄表失败');
     }
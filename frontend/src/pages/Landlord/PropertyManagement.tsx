@@ -1,8 +1,8 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Card, Button, Space, Modal, Form, Input, InputNumber, Select, message, Empty, Menu } from 'antd';
 import { PlusOutlined, ApartmentOutlined, HomeOutlined } from '@ant-design/icons';
 import type { Building, Room } from '../../types';
-import { getBuildings, createLease, getTenants } from '../../services/api';
+import { getBuildings, createLease, searchTenants } from '../../services/api';
 import dayjs from 'dayjs';
 
 const { Option } = Select;
@@ -11,6 +11,8 @@ const PropertyManagement: React.FC = () => {
   const [buildings, setBuildings] = useState<Building[]>([]);
   const [selectedBuilding, setSelectedBuilding] = useState<Building | null>(null);
   const [tenants, setTenants] = useState<any[]>([]);
+  const [searchingTenants, setSearchingTenants] = useState(false);
+  const tenantSearchTimer = useRef<ReturnType<typeof setTimeout>>();
   const [loading, setLoading] = useState(false);
 
   // 模态框状态
@@ -20,7 +22,6 @@ const PropertyManagement: React.FC = () => {
 
   useEffect(() => {
     loadBuildings();
-    loadTenants();
   }, []);
 
   const loadBuildings = async () => {
@@ -38,13 +39,24 @@ const PropertyManagement: React.FC = () => {
     }
   };
 
-  const loadTenants = async () => {
-    try {
-      const data = await getTenants();
-      setTenants(data);
-    } catch (error) {
-      message.error('加载租客失败');
+  // 按姓名或电话在服务端搜索租客，输入停顿后再请求
+  const handleTenantSearch = (value: string) => {
+    clearTimeout(tenantSearchTimer.current);
+    const q = value.trim();
+    if (!q) {
+      setTenants([]);
+      return;
     }
+    tenantSearchTimer.current = setTimeout(async () => {
+      setSearchingTenants(true);
+      try {
+        setTenants(await searchTenants(q));
+      } catch (error) {
+        message.error('搜索租客失败');
+      } finally {
+        setSearchingTenants(false);
+      }
+    }, 250);
   };
 
   const handleBuildingSelect = (buildingId: number) => {
@@ -246,7 +258,14 @@ const PropertyManagement: React.FC = () => {
             label="选择租客"
             rules={[{ required: true, message: '请选择租客' }]}
           >
-            <Select placeholder="请选择租客">
+            <Select
+              showSearch
+              placeholder="输入姓名或电话搜索租客"
+              filterOption={false}
+              onSearch={handleTenantSearch}
+              loading={searchingTenants}
+              notFoundContent={null}
+            >
               {tenants.map(tenant => (
                 <Option key={tenant.id} value={tenant.id}>
                   {tenant.name} ({tenant.phone})
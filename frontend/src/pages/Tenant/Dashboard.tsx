@@ -1,8 +1,8 @@
 import React, { useState, useEffect } from 'react';
 import { Layout, Card, Button, Table, Tag, Space, message, Empty, Statistic, Row, Col } from 'antd';
 import { CalendarOutlined, HomeOutlined, MoneyCollectOutlined, CheckCircleOutlined } from '@ant-design/icons';
-import type { Lease, Bill } from '../../types';
-import { getMyLease, getMyBills, payBill } from '../../services/api';
+import type { Lease, Bill, MyBillSummary, ChangeEvent } from '../../types';
+import { getMyLease, getMyBills, getMySummary, payBill, subscribeEvents } from '../../services/api';
 import dayjs from 'dayjs';
 
 const { Content } = Layout;
@@ -10,21 +10,35 @@ const { Content } = Layout;
 const Dashboard: React.FC = () => {
   const [lease, setLease] = useState<Lease | null>(null);
   const [bills, setBills] = useState<Bill[]>([]);
+  const [summary, setSummary] = useState<MyBillSummary | null>(null);
   const [loading, setLoading] = useState(false);
 
   useEffect(() => {
     loadMyData();
+    // 订阅自己的账单和合同变更：账单变化时只更新该账单和汇总
+    return subscribeEvents(async (event: ChangeEvent) => {
+      if (event.type === 'bill.paid' || event.type === 'bill.metered') {
+        const { bill_id, type, water_fee, elec_fee, total_amount } = event;
+        const patch = type === 'bill.paid' ? { status: 'Paid' } : { water_fee, elec_fee, total_amount };
+        setBills((current) => current.map((bill) => (bill.id === bill_id ? { ...bill, ...patch } as Bill : bill)));
+        setSummary(await getMySummary());
+      } else {
+        loadMyData();
+      }
+    });
   }, []);
 
   const loadMyData = async () => {
     setLoading(true);
     try {
-      const [leaseData, billsData] = await Promise.all([
+      const [leaseData, billsData, summaryData] = await Promise.all([
         getMyLease(),
-        getMyBills()
+        getMyBills(),
+        getMySummary()
       ]);
       setLease(leaseData);
       setBills(billsData);
+      setSummary(summaryData);
     } catch (error) {
       message.error('加载数据失败');
     } finally {
@@ -34,9 +48,11 @@ const Dashboard: React.FC = () => {
 
   const handlePayBill = async (billId: number) => {
     try {
-      await payBill(billId);
+      const updated = await payBill(billId);
       message.success('支付成功！');
-      loadMyData(); // 刷新数据
+      // 直接用返回的账单更新本地状态，其他客户端的变更仍通过事件推送
+      setBills((current) => current.map((bill) => (bill.id === updated.id ? updated : bill)));
+      setSummary(await getMySummary());
     } catch (error: any) {
       message.error(error.response?.data?.detail || '支付失败');
     }
@@ -144,13 +160,9 @@ const Dashboard: React.FC = () => {
     },
   ];
 
-  // 计算统计数据
-  const pendingBills = bills.filter(bill => bill.status === 'Pending');
-  const overdueBills = bills.filter(bill => bill.status === 'Overdue');
-  const paidBills = bills.filter(bill => bill.status === 'Paid');
-
-  const totalPendingAmount = pendingBills.reduce((sum, bill) => sum + bill.total_amount, 0);
-  const totalOverdueAmount = overdueBills.reduce((sum, bill) => sum + bill.total_amount, 0);
+  // 统计数据由后端 /my/summary 汇总
+  const totalPendingAmount = summary?.pending_amount ?? 0;
+  const totalOverdueAmount = summary?.overdue_amount ?? 0;
 
   return (
     <Layout>
@@ -166,7 +178,7 @@ const Dashboard: React.FC = () => {
                 value={totalPendingAmount}
                 precision={2}
                 prefix="¥"
-                suffix={`(${pendingBills.length}笔)`}
+                suffix={`(${summary?.pending_count ?? 0}笔)`}
                 valueStyle={{ color: '#faad14' }}
               />
             </Card>
@@ -178,7 +190,7 @@ const Dashboard: React.FC = () => {
                 value={totalOverdueAmount}
                 precision={2}
                 prefix="¥"
-                suffix={`(${overdueBills.length}笔)`}
+                suffix={`(${summary?.overdue_count ?? 0}笔)`}
                 valueStyle={{ color: '#ff4d4f' }}
               />
             </Card>
@@ -187,7 +199,7 @@ const Dashboard: React.FC = () => {
             <Card>
               <Statistic
                 title="已支付账单"
-                value={paidBills.length}
+                value={summary?.paid_count ?? 0}
                 suffix="笔"
                 valueStyle={{ color: '#52c41a' }}
               />
@@ -229,7 +241,7 @@ const Dashboard: React.FC = () => {
                   <span><strong>合同状态:</strong> <Tag color="green">{lease.status === 'Active' ? '进行中' : lease.status}</Tag></span>
                 </Col>
                 <Col span={8}>
-                  <span><strong>下次交租日:</strong> {bills.length > 0 ? dayjs(bills[0].due_date).format('YYYY-MM-DD') : '暂无'}</span>
+                  <span><strong>下次交租日:</strong> {summary?.next_due_bill ? dayjs(summary.next_due_bill.due_date).format('YYYY-MM-DD') : '暂无'}</span>
                 </Col>
               </Row>
             </div>
@@ -1,5 +1,5 @@
 import axios from 'axios';
-import type { Building, Tenant, Lease, Bill, MeterReadingInput } from '../types';
+import type { Building, Tenant, Lease, Bill, MeterReadingInput, MyBillSummary, ChangeEvent } from '../types';
 
 const API_BASE_URL = 'http://localhost:8000/api';
 
@@ -32,12 +32,22 @@ export const getTenants = async (): Promise<Tenant[]> => {
   return response.data;
 };
 
+export const searchTenants = async (q: string, mode: 'contains' | 'prefix' = 'contains', limit = 20): Promise<Tenant[]> => {
+  const response = await api.get('/tenants/search', { params: { q, mode, limit } });
+  return response.data;
+};
+
 // 房东API
 export const getLeases = async (): Promise<Lease[]> => {
   const response = await api.get('/leases');
   return response.data;
 };
 
+export const getLease = async (leaseId: number, include = 'room,tenant,bills'): Promise<Lease> => {
+  const response = await api.get(`/leases/${leaseId}`, { params: { include } });
+  return response.data;
+};
+
 export const getBills = async (status?: string, building_id?: number): Promise<Bill[]> => {
   const params = new URLSearchParams();
   if (status) params.append('status', status);
@@ -68,9 +78,54 @@ export const getMyBills = async (): Promise<Bill[]> => {
   return response.data;
 };
 
+export const getMySummary = async (): Promise<MyBillSummary> => {
+  const response = await api.get('/my/summary');
+  return response.data;
+};
+
 export const payBill = async (billId: number): Promise<Bill> => {
   const response = await api.post(`/my/bills/${billId}/pay`, {});
   return response.data;
 };
 
+// 变更事件（SSE）：EventSource 不能携带身份请求头，这里用 fetch 读取事件流，断开后自动重连
+export const subscribeEvents = (onEvent: (event: ChangeEvent) => void, buildingId?: number): (() => void) => {
+  const controller = new AbortController();
+  const role = localStorage.getItem('role') || 'landlord';
+  const tenantId = localStorage.getItem('tenantId');
+  const headers: Record<string, string> = role === 'landlord' ? { 'X-Role': 'landlord' } : { 'X-Tenant-Id': tenantId || '' };
+  const url = `${API_BASE_URL}/events${buildingId ? `?building_id=${buildingId}` : ''}`;
+
+  const connect = async () => {
+    while (!controller.signal.aborted) {
+      try {
+        const response = await fetch(url, { headers, signal: controller.signal });
+        if (!response.ok || !response.body) throw new Error(`HTTP ${response.status}`);
+        const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = '';
+        for (;;) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffer += value;
+          const blocks = buffer.split('\n\n');
+          buffer = blocks.pop() || '';
+          for (const block of blocks) {
+            const data = block.split('\n').find((line) => line.startsWith('data: '));
+            const type = block.split('\n').find((line) => line.startsWith('event: '));
+            if (data && type) onEvent({ ...JSON.parse(data.slice(6)), type: type.slice(7) });
+          }
+        }
+        // 连接断开期间可能漏掉事件
+        onEvent({ type: 'resync' });
+      } catch (error) {
+        if (controller.signal.aborted) return;
+      }
+      await new Promise((resolve) => setTimeout(resolve, 3000));
+    }
+  };
+
+  connect();
+  return () => controller.abort();
+};
+
 export default api;
\ No newline at end of file
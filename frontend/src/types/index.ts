@@ -30,7 +30,7 @@ export interface Lease {
   rent_amount: number;
   deposit: number;
   status: string;
-  bills: Bill[];
+  bills?: Bill[];
   room?: Room;
   tenant?: Tenant;
 }
@@ -47,6 +47,16 @@ export interface Bill {
   due_date: string;
 }
 
+export interface MyBillSummary {
+  pending_count: number;
+  overdue_count: number;
+  paid_count: number;
+  pending_amount: number;
+  overdue_amount: number;
+  outstanding_amount: number;
+  next_due_bill: Bill | null;
+}
+
 export interface MeterReadingInput {
   current_water_reading: number;
   current_elec_reading: number;
@@ -63,4 +73,20 @@ export interface UserContextType {
 export interface BillWithDetails extends Bill {
   room_number?: string;
   tenant_name?: string;
-}
\ No newline at end of file
+}
+export interface ChangeEvent {
+  type: 'bill.paid' | 'bill.metered' | 'lease.created' | 'resync';
+  tenant_id?: number;
+  building_id?: number;
+  bill_id?: number;
+  lease_id?: number;
+  room_id?: number;
+  period?: string;
+  total_amount?: number;
+  water_usage?: number;
+  elec_usage?: number;
+  water_fee?: number;
+  elec_fee?: number;
+  start_date?: string;
+  end_date?: string;
+}